@@ -98,11 +98,16 @@ class InMemoryEventStore:
         active = self.active()
         if not active:
             return 0
-        versions = [getattr(ev, "version", None) for ev in active]
-        if all(isinstance(v, int) for v in versions):
-            min_v = min(versions)
-            max_v = max(versions)
-            if max_v - min_v + 1 == len(versions):
-                return min_v - 1
-            return max_v - len(versions)
-        return 0
+        # Una sola pasada: valida, y acumula mínimo y máximo a la vez.
+        min_v = max_v = None
+        for ev in active:
+            v = getattr(ev, "version", None)
+            if not isinstance(v, int):
+                return 0
+            if min_v is None or v < min_v:
+                min_v = v
+            if max_v is None or v > max_v:
+                max_v = v
+        if max_v - min_v + 1 == len(active):
+            return min_v - 1
+        return max_v - len(active)
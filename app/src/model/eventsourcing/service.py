@@ -320,7 +320,16 @@ class GraphES:
     @staticmethod
     def rebuild(events: List[Event]) -> ReliabilityGraph:
         g = ReliabilityGraph(auto_normalize=True)
-        for i in GraphES._effective_indices(events):
+        active = GraphES._effective_indices(events)
+        # Un SnapshotEvent reemplaza el grafo completo: lo anterior a la
+        # última snapshot activa se descartaría igual, así que el replay
+        # parte desde ella.
+        start = 0
+        for pos in range(len(active) - 1, -1, -1):
+            if isinstance(events[active[pos]], SnapshotEvent):
+                start = pos
+                break
+        for i in active[start:]:
             ev = events[i]
             if isinstance(ev, SnapshotEvent):
                 g = ReliabilityGraph.from_data(ev.data)
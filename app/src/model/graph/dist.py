@@ -31,6 +31,19 @@ def _parse_date_any(x: Union[str, datetime, date, float, int]) -> Optional[datet
                 return None
     return None
 
+def _parse_fail_date(raw: object) -> Optional[datetime]:
+    """Fecha de una fila del cache de fallas; None si no es parseable."""
+    text = str(raw)
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    # tolerante: fecha sin ceros a la izquierda (YYYY-M-D)
+    try:
+        return datetime.strptime(text, "%Y-%m-%d")
+    except ValueError:
+        return None
+
 def _days_between(a: datetime, b: datetime) -> float:
     return (b - a).total_seconds() / 86400.0
 
@@ -48,16 +61,9 @@ def _get_sorted_fail_dates(
     out: List[datetime] = []
     for tup in rows:
         if isinstance(tup, (list, tuple)) and tup:
-            try:
-                dt = datetime.fromisoformat(str(tup[0]))
+            dt = _parse_fail_date(tup[0])
+            if dt is not None:
                 out.append(dt)
-            except Exception:
-                # tolerante: intenta sólo fecha YYYY-MM-DD
-                try:
-                    dt = datetime.strptime(str(tup[0]), "%Y-%m-%d")
-                    out.append(dt)
-                except Exception:
-                    pass
     out.sort()
     return out
 
@@ -73,13 +79,9 @@ def _build_edad_delta(
     tmp: List[Tuple[datetime, str]] = []
     for tup in rows:
         if isinstance(tup, (list, tuple)) and tup:
-            try:
-                dt = datetime.fromisoformat(str(tup[0]))
-            except Exception:
-                try:
-                    dt = datetime.strptime(str(tup[0]), "%Y-%m-%d")
-                except Exception:
-                    continue
+            dt = _parse_fail_date(tup[0])
+            if dt is None:
+                continue
             ty = str(tup[1]) if len(tup) > 1 else ""
             tmp.append((dt, ty))
     tmp.sort(key=lambda x: x[0])
@@ -13,6 +13,29 @@ class SystemClock:
     def now(self) -> datetime:
         return datetime.today()
 
+class _PassFailuresCache:
+    """
+    Envoltorio del cache de fallas válido durante una evaluación: cada
+    componente lo consulta varias veces (registros suficientes, fechas,
+    ajuste de parámetros) y sin esto cada consulta relee el archivo.
+    """
+
+    def __init__(self, inner: "FailuresCachePort"):
+        self._inner = inner
+        self._loaded: Dict[Optional[str], Dict] = {}
+
+    def load_failures_cache(self, project_root: Optional[str] = None) -> Dict:
+        data = self._loaded.get(project_root)
+        if data is None:
+            data = self._inner.load_failures_cache(project_root)
+            self._loaded[project_root] = data
+        return data
+
+    def save_failures_cache(self, cache: Dict, project_root: Optional[str] = None) -> None:
+        self._loaded.clear()
+        self._inner.save_failures_cache(cache, project_root)
+
+
 class ReliabilityEvaluator:
     """Separa la lógica de evaluación del grafo"""
     
@@ -21,6 +44,7 @@ class ReliabilityEvaluator:
         self.project_root: Optional[str] = None
         self.failures_cache: Optional["FailuresCachePort"] = None
         self.clock: Clock = SystemClock()
+        self._now: Optional[datetime] = None
     
     def set_project_root(self, root: Optional[str]):
         self.project_root = root
@@ -32,8 +56,23 @@ class ReliabilityEvaluator:
         if self.graph.root is None:
             return 1.0
         
-        memo: Dict[str, float] = {}
-        return self._eval_node(self.graph.root, memo)
+        # Un único instante de evaluación para todos los componentes
+        self._now = self.clock.now()
+        failures_cache = self.failures_cache
+        if failures_cache is not None:
+            self.failures_cache = _PassFailuresCache(failures_cache)
+        try:
+            memo: Dict[str, float] = {}
+            return self._eval_node(self.graph.root, memo)
+        finally:
+            self._now = None
+            self.failures_cache = failures_cache
+
+    def now(self) -> datetime:
+        """Instante de la evaluación en curso (o el reloj si no hay una)."""
+        if self._now is not None:
+            return self._now
+        return self.clock.now()
     
     def _clear_previous_results(self):
         for node in self.graph.nodes.values():
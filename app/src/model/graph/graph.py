@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Literal, Any, Callable
+from typing import Dict, Iterator, List, Optional, Literal, Any, Callable, Tuple
 from .node import (
     Node,
     ComponentNode,
@@ -16,6 +16,17 @@ from ..failure.ports import FailuresCachePort
 GateType = GateSubtype
 RelType = Literal["series", "parallel", "koon"]
 
+_GATE_TYPE_BY_RELATION: Dict[str, GateType] = {
+    "series": "AND",
+    "parallel": "OR",
+    "koon": "KOON",
+}
+_GATE_ID_PREFIX: Dict[str, str] = {
+    "AND": "G_and",
+    "OR": "G_or",
+    "KOON": "G_koon",
+}
+
 
 class ReliabilityGraph:
     """
@@ -45,6 +56,9 @@ class ReliabilityGraph:
 
         self.failures_cache: Optional[FailuresCachePort] = None
 
+        # Sorted component ids, rebuilt lazily after node add/remove/rename
+        self._component_ids: Optional[List[str]] = None
+
     # PUBLIC API - Core graph operations
 
     def count_components(self) -> int:
@@ -56,8 +70,40 @@ class ReliabilityGraph:
         """
         return sum(1 for node in self.nodes.values() if node.is_component())
 
+    def component_ids(self) -> List[str]:
+        """
+        Sorted ids of the component nodes in the graph.
+
+        The list is cached and only rebuilt after nodes are added, removed
+        or renamed, so callers must treat it as read-only.
+
+        Returns:
+            Sorted list of component node ids
+        """
+        ids = self._component_ids
+        if ids is None:
+            ids = sorted(
+                node_id
+                for node_id, node in self.nodes.items()
+                if isinstance(node, ComponentNode)
+            )
+            self._component_ids = ids
+        return ids
+
+    def components(self) -> Iterator[Tuple[str, ComponentNode]]:
+        """
+        Iterate over component nodes using the cached component id index.
+
+        Yields:
+            (node_id, node) pairs, sorted by node id
+        """
+        nodes = self.nodes
+        for node_id in self.component_ids():
+            yield node_id, nodes[node_id]
+
     def clear(self) -> None:
         """Clear all nodes, edges, and reset the graph"""
+        self._component_ids = None
         self.nodes.clear()
         self.children.clear()
         self.parent.clear()
@@ -80,6 +126,7 @@ class ReliabilityGraph:
         self.nodes[node.id] = node
         self.children[node.id] = []
         self.parent[node.id] = None
+        self._component_ids = None
         
         # First node becomes root
         if self.root is None:
@@ -543,6 +590,7 @@ class ReliabilityGraph:
             self.children.pop(gid, None)
             self.parent.pop(gid, None)
             self.nodes.pop(gid, None)
+        self._component_ids = None
 
     def _remove_component(self, node_id: str) -> None:
         """Remove a component node"""
@@ -565,6 +613,7 @@ class ReliabilityGraph:
         children = self.children.pop(old_id)
         parent_id = self.parent.pop(old_id)
         self.nodes.pop(old_id)
+        self._component_ids = None
         
         # Update node ID
         node.id = new_id
@@ -599,6 +648,7 @@ class ReliabilityGraph:
         self.children.pop(node_id, None)
         self.parent.pop(node_id, None)
         self.nodes.pop(node_id, None)
+        self._component_ids = None
 
     def _replace_child(
         self,
@@ -754,12 +804,7 @@ class ReliabilityGraph:
 
     def _relation_to_gate_type(self, relation: RelType) -> GateType:
         """Convert relation type to gate type"""
-        if relation == "series":
-            return "AND"
-        elif relation == "parallel":
-            return "OR"
-        else:  # koon
-            return "KOON"
+        return _GATE_TYPE_BY_RELATION.get(relation, "KOON")
 
     def _interpose_gate(
         self,
@@ -777,11 +822,7 @@ class ReliabilityGraph:
             ID of the newly created gate
         """
         # Generate gate ID
-        prefix = {
-            "AND": "G_and",
-            "OR": "G_or",
-            "KOON": "G_koon"
-        }.get(gate_type, "G_auto")
+        prefix = _GATE_ID_PREFIX.get(gate_type, "G_auto")
         
         gate_id = self._alloc_gate_id(prefix)
         if gate_guid is None and gate_guid_factory is not None:
@@ -60,7 +60,7 @@ class ComponentNode(Node):
 
         return self.dist.reliability(
             node_id,
-            evaluator.clock.now(),
+            evaluator.now(),
             project_root=evaluator.project_root,
             cache=evaluator.failures_cache,
         )
@@ -170,10 +170,13 @@ class KoonGateNode(GateNode):
         dp = [0.0] * (n + 1)
         dp[0] = 1.0
 
-        for p in probs:
-            for j in range(n, 0, -1):
-                dp[j] = dp[j] * (1.0 - p) + dp[j - 1] * p
-            dp[0] = dp[0] * (1.0 - p)
+        # Tras procesar i hijos sólo dp[0..i] puede ser distinto de cero,
+        # así que el barrido interno se acota a ese rango.
+        for i, p in enumerate(probs, start=1):
+            q = 1.0 - p
+            for j in range(i, 0, -1):
+                dp[j] = dp[j] * q + dp[j - 1] * p
+            dp[0] *= q
 
         return sum(dp[k:])
 
@@ -1,16 +1,23 @@
+import sys
 from typing import TYPE_CHECKING, Dict, Any
 from .node import Node, ComponentNode, create_gate_node
 
 if TYPE_CHECKING:
     from .graph import ReliabilityGraph
 
+
+def _intern_id(value: Any) -> Any:
+    # Los ids se usan como llave en nodes/children/parent y se repiten en
+    # edges: internados, las búsquedas comparan por identidad.
+    return sys.intern(value) if type(value) is str else value
+
 class GraphSerializer:
     """Maneja serialización/deserialización"""
     
     @staticmethod
     def to_data(graph: 'ReliabilityGraph') -> Dict[str, Any]:
-        nodes = [GraphSerializer._serialize_node(nid, node) 
-                 for nid, node in graph.nodes.items()]
+        serialize = GraphSerializer._serialize_node
+        nodes = [serialize(nid, node) for nid, node in graph.nodes.items()]
         edges = [{"from": parent, "to": child} 
                  for parent, children in graph.children.items() 
                  for child in children]
@@ -40,6 +47,7 @@ class GraphSerializer:
         
         g = ReliabilityGraph(auto_normalize=True)
         g.clear()
+        add_node = g.add_node
         
         # Load nodes
         for nd in data.get("nodes", []):
@@ -50,21 +58,21 @@ class GraphSerializer:
                     d = Dist(kind=dist["kind"])
                 
                 node = ComponentNode(
-                    id=nd["id"],
+                    id=_intern_id(nd["id"]),
                     dist=d,
                     unit_type=nd.get("unit_type")
                 )
-                g.add_node(node)
+                add_node(node)
                 
                 # Restore reliability if present
                 if "reliability" in nd:
-                    g.nodes[nd["id"]].reliability = nd["reliability"]
+                    node.reliability = nd["reliability"]
                 
                 # Restore conflict flag
-                g.nodes[nd["id"]].conflict = bool(nd.get("conflict", False))
+                node.conflict = bool(nd.get("conflict", False))
                 
             elif nd["type"] == "gate":
-                subtype = nd.get("subtype", "AND")
+                subtype = _intern_id(nd.get("subtype", "AND"))
                 gate_kwargs: Dict[str, Any] = {
                     "name": nd.get("name"),
                     "label": nd.get("label"),
@@ -73,19 +81,20 @@ class GraphSerializer:
                     gate_kwargs["guid"] = nd.get("guid")
                 if subtype == "KOON":
                     gate_kwargs["k"] = nd.get("k") or 1
-                node = create_gate_node(subtype, nd["id"], **gate_kwargs)
-                g.add_node(node)
+                node = create_gate_node(subtype, _intern_id(nd["id"]), **gate_kwargs)
+                add_node(node)
                 
                 # Restore reliability if present
                 if "reliability" in nd:
-                    g.nodes[nd["id"]].reliability = nd["reliability"]
+                    node.reliability = nd["reliability"]
         
         # Load edges
+        add_edge = g.add_edge
         for e in data.get("edges", []):
-            g.add_edge(e["from"], e["to"])
+            add_edge(_intern_id(e["from"]), _intern_id(e["to"]))
         
         # Restore root
-        g.root = data.get("root", g.root)
+        g.root = _intern_id(data.get("root", g.root))
         
         # Restore total reliability
         if "reliability_total" in data:
@@ -5,6 +5,8 @@ from __future__ import annotations
 
 import sys
 import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from typing import TYPE_CHECKING
 
@@ -14,10 +16,22 @@ if TYPE_CHECKING:
 from src.model.graph.graph import ReliabilityGraph
 from src.model.eventsourcing.events import SnapshotEvent, SetIgnoreRangeEvent, event_from_dict
 from src.services.cache.event_store import EventStore
+from src.services.api.graph_snapshot import is_stable_snapshot
 from src.services.remote.errors import normalize_cloud_error
 from datetime import datetime, timezone
 
 
+REBUILD_CACHE_SIZE = 8
+_EMPTY: dict = {}
+
+
+class InvalidVersionError(ValueError):
+    def __init__(self, version: int, head: int):
+        super().__init__(f"version {version} is beyond head {head}")
+        self.version = version
+        self.head = head
+
+
 class CloudCoordinator:
     """
     Coordinador para operaciones cloud.
@@ -80,61 +94,80 @@ class CloudCoordinator:
             ):
                 need_fetch.append(component_id)
 
+        # Componentes, snapshot y eventos son lecturas independientes (cada
+        # una usa su propio cliente SharePoint), así que se lanzan en paralelo
+        # y el tiempo total queda acotado por la más lenta.
         fetched: dict = {}
-        if need_fetch:
-            with (perf.stage("fetch_components", count=len(need_fetch)) if perf else nullcontext()):
-                fetched = cloud.fetch_components(
-                    need_fetch,
+        with (perf.stage("load_cloud_state", components=len(need_fetch)) if perf else nullcontext()):
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="cloud-load") as pool:
+                components_future = None
+                if need_fetch:
+                    components_future = pool.submit(
+                        cloud.fetch_components,
+                        need_fetch,
+                        update_local=False,
+                        allow_local_fallback=False,
+                        operation="cloud-load",
+                    )
+                snap_future = pool.submit(
+                    cloud.load_snapshot,
                     update_local=False,
                     allow_local_fallback=False,
                     operation="cloud-load",
-                ) or {}
-
-        with (perf.stage("load_snapshot") if perf else nullcontext()):
-            snap = cloud.load_snapshot(
-                update_local=False,
-                allow_local_fallback=False,
-                operation="cloud-load",
-            ) or {}
-        
-        with (perf.stage("load_events") if perf else nullcontext()):
-            events = cloud.load_events(
-                update_local=False,
-                allow_local_fallback=False,
-                operation="cloud-load",
-            )
+                )
+                events_future = pool.submit(
+                    cloud.load_events,
+                    update_local=False,
+                    allow_local_fallback=False,
+                    operation="cloud-load",
+                )
+                if components_future is not None:
+                    fetched = components_future.result() or {}
+                snap = snap_future.result() or {}
+                events = events_future.result()
         
-        with (perf.stage("build_graph_from_snapshot", snapshot_bytes=self._json_size(snap)) if perf else nullcontext()):
+        # Sólo se usa como metadata de perf: se serializa una vez
+        snapshot_bytes = self._json_size(snap) if perf else 0
+
+        with (perf.stage("build_graph_from_snapshot", snapshot_bytes=snapshot_bytes) if perf else nullcontext()):
             graph = ReliabilityGraph.from_data(snap)
         
         if local:
             graph.failures_cache = local.failures_cache
 
+        # `fetched` es una respuesta recién descargada y sólo se usa aquí:
+        # se completa cada meta en sitio en vez de copiarla entera.
         items_to_cache = []
         for component_id, meta in fetched.items():
-            item = dict(meta or {})
-            name = item.get("kks_name") or item.get("title") or component_id
-            item.setdefault("title", name)
-            item.setdefault("id", component_id)
+            item = meta if isinstance(meta, dict) else {}
+            if "title" not in item:
+                item["title"] = item.get("kks_name") or component_id
+            if "id" not in item:
+                item["id"] = component_id
             items_to_cache.append(item)
 
+        cache = None
         if local and items_to_cache:
             with (perf.stage("update_components_cache", count=len(items_to_cache)) if perf else nullcontext()):
-                local.upsert_components_cache(items_to_cache)
+                # upsert devuelve el cache ya actualizado: se reutiliza abajo
+                cache = local.upsert_components_cache(items_to_cache)
 
+        filled_unit_types = 0
         try:
-            cache = local.load_components_cache() if local else {}
-            for node_id, node in graph.nodes.items():
-                if node.is_component() and not getattr(node, "unit_type", None):
-                    unit_type = (cache.get(node_id, {}) or {}).get("type")
+            if cache is None:
+                cache = local.load_components_cache() if local else {}
+            for node_id, node in graph.components():
+                if not node.unit_type:
+                    unit_type = (cache.get(node_id) or _EMPTY).get("type")
                     if unit_type:
                         node.unit_type = unit_type
+                        filled_unit_types += 1
         except Exception:
             pass
 
         try:
             if local:
-                with (perf.stage("save_snapshot_local", snapshot_bytes=self._json_size(snap)) if perf else nullcontext()):
+                with (perf.stage("save_snapshot_local", snapshot_bytes=snapshot_bytes) if perf else nullcontext()):
                     local.save_snapshot(snap)
         except Exception:
             pass
@@ -154,23 +187,20 @@ class CloudCoordinator:
             pass
 
         self.shared.es.graph = graph
-        self.shared.cloud_baseline = graph.to_data()
+        # Si el grafo quedó igual al snapshot descargado, el snapshot sirve
+        # directamente como baseline y no hace falta volver a serializarlo.
+        if filled_unit_types == 0 and is_stable_snapshot(snap):
+            self.shared.cloud_baseline = snap
+        else:
+            self.shared.cloud_baseline = graph.to_data()
 
         try:
             if self.shared.es.store:
-                with (perf.stage("update_base_version") if perf else nullcontext()):
-                    sp_events = self.shared.cloud._sp_events()
-                    if sp_events:
-                        max_version = sp_events.get_max_version()
-                        self.shared.es.store.base_version = max_version
-                    else:
-                        self.shared.es.store.base_version = len(events)
+                # El log recién descargado ya trae la versión máxima; no hace
+                # falta otra consulta a SharePoint para conocer el HEAD.
+                self.shared.es.store.base_version = self._max_event_version(events)
         except Exception:
-            try:
-                if self.shared.es.store:
-                    self.shared.es.store.base_version = len(events)
-            except Exception:
-                pass
+            pass
     
     # ========== Cloud Save ==========
     
@@ -274,9 +304,7 @@ class CloudCoordinator:
             perf: Logger de performance opcional
         """
         cache = self.shared.local.load_components_cache()
-        component_ids = sorted(
-            [node_id for node_id, node in graph.nodes.items() if node.is_component()]
-        )
+        component_ids = graph.component_ids()
         comp_entries = []
         for component_id in component_ids:
             etag = (cache.get(component_id) or {}).get("etag")
@@ -320,6 +348,9 @@ class CloudCoordinator:
             
         Returns:
             Dict con información del resultado (version, head_previous, etc.)
+
+        Raises:
+            InvalidVersionError: Si la versión pedida es mayor que el HEAD
         """
         with perf.stage("load_events") if perf else nullcontext():
             events = self._load_event_objects(
@@ -328,10 +359,29 @@ class CloudCoordinator:
             )
         
         head_prev = len(events)
-        events_upto = self._events_upto_version(events, version)
-        
-        with perf.stage("rebuild_graph", events_count=len(events_upto)) if perf else nullcontext():
-            graph = self.shared.es.rebuild(events_upto)
+
+        if version > head_prev:
+            raise InvalidVersionError(version, head_prev)
+
+        if version == head_prev:
+            # Rebuild al HEAD: el estado cloud ya es ese, no hay nada que escribir
+            try:
+                self.shared.local.draft_delete()
+            except Exception:
+                pass
+            return {
+                "version": version,
+                "head_previous": head_prev,
+                "snapshot": {},
+                "snapshot_bytes": 0,
+                "events_count": len(events),
+                "append_events": 0,
+            }
+
+        # Comparte cache con GET .../version/{v}/graph: el flujo habitual es
+        # previsualizar la versión y luego confirmar el rebuild.
+        with perf.stage("rebuild_graph", events_count=len(events)) if perf else nullcontext():
+            graph = self.rebuild_upto_version(events, version)
         
         with perf.stage("graph_to_data") if perf else nullcontext():
             snapshot = graph.to_data()
@@ -342,19 +392,17 @@ class CloudCoordinator:
         snapshot_dict = snapshot_event.to_dict()
         snapshot_dict["version"] = head_prev + 1
 
-        to_append = [snapshot_dict]
+        ignore_event = SetIgnoreRangeEvent.create(
+            start_v=version + 1,
+            end_v=head_prev,
+            actor="version-control",
+        )
+        ignore_dict = ignore_event.to_dict()
+        ignore_dict["version"] = head_prev + 2
 
-        if version < head_prev:
-            ignore_event = SetIgnoreRangeEvent.create(
-                start_v=version + 1,
-                end_v=head_prev,
-                actor="version-control",
-            )
-            ignore_dict = ignore_event.to_dict()
-            ignore_dict["version"] = head_prev + 2
-            to_append.append(ignore_dict)
+        to_append = [snapshot_dict, ignore_dict]
 
-        self.execute_rebuild_commit(snapshot, to_append, perf=perf)
+        snapshot_bytes = self.execute_rebuild_commit(snapshot, to_append, perf=perf)
 
         try:
             self.shared.local.draft_delete()
@@ -365,6 +413,7 @@ class CloudCoordinator:
             "version": version,
             "head_previous": head_prev,
             "snapshot": snapshot,
+            "snapshot_bytes": snapshot_bytes,
             "events_count": len(events),
             "append_events": len(to_append),
         }
@@ -374,7 +423,7 @@ class CloudCoordinator:
         snapshot: dict,
         to_append: list[dict],
         perf: "PerfLogger | None" = None,
-    ) -> None:
+    ) -> int:
         """
         Ejecuta el commit atómico de rebuild.
         
@@ -382,14 +431,18 @@ class CloudCoordinator:
             snapshot: Snapshot a guardar
             to_append: Eventos a agregar
             perf: Logger de performance opcional
+
+        Returns:
+            Tamaño en bytes del snapshot (0 sin perf), para no serializarlo de nuevo
         """
-        snapshot_bytes = self._json_size(snapshot)
+        snapshot_bytes = self._json_size(snapshot) if perf else 0
         with (perf.stage("cloud_atomic_operation", events_count=len(to_append), snapshot_bytes=snapshot_bytes) if perf else nullcontext()):
             with self.shared.cloud.atomic_operation("rebuild") as op:
                 with (perf.stage("append_events", events_count=len(to_append)) if perf else nullcontext()):
                     op.append_events(to_append)
                 with (perf.stage("save_snapshot", snapshot_bytes=snapshot_bytes) if perf else nullcontext()):
                     op.save_snapshot(snapshot)
+        return snapshot_bytes
     
     # ========== Utilities ==========
     
@@ -398,10 +451,10 @@ class CloudCoordinator:
         Obtiene la versión HEAD actual de cloud.
         
         Returns:
-            Número de versión HEAD (número total de eventos en cloud)
+            Número de versión HEAD (versión máxima del log en cloud)
         """
         try:
-            return len(self.shared.cloud.load_events())
+            return self.shared.cloud.get_head_version()
         except Exception:
             return 0
     
@@ -410,34 +463,100 @@ class CloudCoordinator:
         *,
         operation: str = "event-history",
         allow_local_fallback: bool = True,
+        upto_version: int | None = None,
     ) -> list[object]:
-        """Carga eventos desde cloud como objetos Event."""
+        """
+        Carga eventos desde cloud como objetos Event.
+
+        Con `upto_version` sólo se deserializan los eventos hasta esa
+        versión: los posteriores se descartan mirando el dict crudo.
+        """
         raw = self.shared.cloud.load_events(
             allow_local_fallback=allow_local_fallback,
             operation=operation,
         )
         events: list[object] = []
-        for entry in raw:
+        for idx, entry in enumerate(raw):
+            if upto_version is not None and isinstance(entry, dict):
+                ver = entry.get("version")
+                if (ver if isinstance(ver, int) else idx + 1) > upto_version:
+                    continue
             try:
                 events.append(event_from_dict(entry))
             except Exception:
                 continue
         return events
     
+    def rebuild_upto_version(self, all_events: list[object], version: int) -> ReliabilityGraph:
+        """
+        Reconstruye el grafo en `version`, reutilizando rebuilds recientes.
+
+        La clave identifica el prefijo de eventos (versión pedida, cantidad
+        y último evento), así que un log que cambió produce otra clave y
+        nunca se sirve un grafo obsoleto.
+
+        Args:
+            all_events: Eventos completos (objetos Event)
+            version: Versión objetivo
+
+        Returns:
+            Grafo reconstruido (compartido: no mutar)
+        """
+        events_upto = self._events_upto_version(all_events, version)
+        last = events_upto[-1] if events_upto else None
+        key = (
+            version,
+            len(events_upto),
+            getattr(last, "version", None),
+            getattr(last, "ts", None),
+        )
+
+        cache = self.shared.rebuild_cache
+        graph = cache.get(key)
+        if graph is not None:
+            cache.move_to_end(key)
+            return graph
+
+        graph = self.shared.es.rebuild(events_upto)
+        cache[key] = graph
+        while len(cache) > REBUILD_CACHE_SIZE:
+            cache.popitem(last=False)
+        return graph
+
+    @staticmethod
+    def _max_event_version(events: list[dict]) -> int:
+        """Versión máxima de una lista de eventos crudos (o su largo si no hay)."""
+        max_v = None
+        for ev in events:
+            if not isinstance(ev, dict):
+                continue
+            v = ev.get("version")
+            if isinstance(v, int) and (max_v is None or v > max_v):
+                max_v = v
+        return max_v if max_v is not None else len(events)
+
     @staticmethod
     def _safe_event_version(event: object, index: int) -> int:
         """Extrae versión de evento de forma segura."""
-        ver = getattr(event, "version", None)
-        return ver if isinstance(ver, int) else (index + 1)
+        try:
+            ver = event.version
+        except AttributeError:
+            return index + 1
+        return ver if type(ver) is int else (index + 1)
     
     def _events_upto_version(self, all_events: list[object], version: int) -> list[object]:
         """Filtra eventos hasta una versión específica."""
-        events_upto = []
-        for idx, event in enumerate(all_events):
-            ver = self._safe_event_version(event, idx)
-            if ver <= version:
-                events_upto.append(event)
-        return events_upto
+        safe_version = self._safe_event_version
+        versions = [safe_version(event, idx) for idx, event in enumerate(all_events)]
+        # El log de SharePoint viene ordenado por versión: basta un corte
+        # con bisect. Si no lo estuviera, se filtra evento por evento.
+        if all(a <= b for a, b in zip(versions, versions[1:])):
+            return all_events[: bisect_right(versions, version)]
+        return [
+            event
+            for event, ver in zip(all_events, versions)
+            if ver <= version
+        ]
     
     @staticmethod
     def _json_size(payload: object) -> int:
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 from src.model.graph.graph import ReliabilityGraph
 from src.model.eventsourcing.events import event_from_dict
 from src.services.cache.event_store import EventStore
+from src.services.api.graph_snapshot import is_stable_snapshot
 
 
 class DraftCoordinator:
@@ -187,7 +188,10 @@ class DraftCoordinator:
             meta: Metadata del draft (incluye base_version)
         """
         self.shared.es.graph = ReliabilityGraph.from_data(snapshot or {})
-        self.shared.cloud_baseline = self.shared.es.graph.to_data()
+        if is_stable_snapshot(snapshot):
+            self.shared.cloud_baseline = snapshot
+        else:
+            self.shared.cloud_baseline = self.shared.es.graph.to_data()
         
         if not self.shared.es.store:
             self.shared.es.set_store(EventStore(self.shared.local))
@@ -247,6 +251,6 @@ class DraftCoordinator:
     def _get_cloud_head_version(self) -> int:
         """Obtiene versión HEAD de cloud."""
         try:
-            return len(self.shared.cloud.load_events())
+            return self.shared.cloud.get_head_version()
         except Exception:
             return 0
\ No newline at end of file
@@ -15,11 +15,17 @@ class EvaluationCoordinator:
 
     def _ensure_service(self) -> EvaluationService:
         if self._service is None:
-            self._service = EvaluationService.from_env(
-                es=self.shared.es,
-                failures_cache=self.shared.local.failures_cache,
-                project_root=self.shared.base_dir,
-            )
+            # Los handlers crean un coordinador por request; el servicio (y
+            # con él la sesión Graph y su token) vive en el estado compartido.
+            service = self.shared.evaluation_service
+            if service is None or service.es is not self.shared.es:
+                service = EvaluationService.from_env(
+                    es=self.shared.es,
+                    failures_cache=self.shared.local.failures_cache,
+                    project_root=self.shared.base_dir,
+                )
+                self.shared.evaluation_service = service
+            self._service = service
         return self._service
 
     def ensure_failures(self) -> dict:
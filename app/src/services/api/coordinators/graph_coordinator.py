@@ -289,10 +289,20 @@ class GraphCoordinator:
         Returns:
             True si se deshizo algo, False si no había nada que deshacer
         """
-        if self.shared.es.store and self.shared.es.store.undo():
-            self.replay_local()
-            return True
-        return False
+        store = self.shared.es.store
+        if not store:
+            return False
+        active = store.active()
+        if not store.undo():
+            return False
+        # Los eventos no guardan su inverso, así que undo reconstruye; el
+        # grafo descartado se guarda para que un redo inmediato no tenga
+        # que volver a reconstruirlo.
+        before = self.shared.es.graph
+        self.replay_local()
+        if active:
+            self.shared.redo_stash.append((active[-1], before, self.shared.es.graph))
+        return True
     
     def redo(self) -> bool:
         """
@@ -301,7 +311,18 @@ class GraphCoordinator:
         Returns:
             True si se rehizo algo, False si no había nada que rehacer
         """
-        if self.shared.es.store and self.shared.es.store.redo():
-            self.replay_local()
-            return True
-        return False
\ No newline at end of file
+        store = self.shared.es.store
+        if not store or not store.redo():
+            return False
+        stash = self.shared.redo_stash
+        if stash:
+            event, before, after = stash.pop()
+            active = store.active()
+            if active and active[-1] is event and self.shared.es.graph is after:
+                self.shared.es.graph = before
+                return True
+            # El grafo o el historial cambiaron desde el undo: lo guardado ya
+            # no corresponde a este estado.
+            stash.clear()
+        self.replay_local()
+        return True
\ No newline at end of file
@@ -10,6 +10,27 @@ def serialize_graph(graph: ReliabilityGraph) -> Dict[str, Any]:
     return graph.to_data()
 
 
+def is_stable_snapshot(data: Any) -> bool:
+    """
+    True si reconstruir el grafo desde `data` da siempre el mismo resultado,
+    de modo que `data` puede usarse como baseline sin pasar por to_data().
+
+    Los gates sin guid reciben uno aleatorio en from_data, así que un
+    snapshot con gates sin guid no es estable entre rebuilds.
+    """
+    if not isinstance(data, dict):
+        return False
+    nodes = data.get("nodes")
+    if not isinstance(nodes, list):
+        return False
+    for nd in nodes:
+        if not isinstance(nd, dict):
+            return False
+        if nd.get("type") == "gate" and not nd.get("guid"):
+            return False
+    return True
+
+
 def serialize_node(graph: ReliabilityGraph, node_id: str) -> Optional[Dict[str, Any]]:
     node = graph.nodes.get(node_id)
     if not node:
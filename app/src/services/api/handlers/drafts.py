@@ -11,8 +11,9 @@ if TYPE_CHECKING:
     from http.server import BaseHTTPRequestHandler
 
 from .base import BaseHandler
-from ..coordinators import DraftCoordinator, CloudCoordinator
+from ..coordinators import DraftCoordinator
 from ...cache.repositories.draft import DraftsFullError
+from src.services.remote.errors import CloudOperationError
 
 
 class DraftHandler(BaseHandler):
@@ -31,7 +32,6 @@ class DraftHandler(BaseHandler):
     def __init__(self, shared: SharedState, request_handler: BaseHTTPRequestHandler):
         super().__init__(shared, request_handler)
         self.coordinator = DraftCoordinator(shared)
-        self.cloud_coordinator = CloudCoordinator(shared)
     
     # ========== Handlers GET ==========
     
@@ -85,7 +85,21 @@ class DraftHandler(BaseHandler):
             self._send_json(404, {"error": "missing draft id"})
             return
         
-        cloud_head = self.cloud_coordinator.get_head_version()
+        # Un HEAD no leído no puede usarse para detectar conflictos: el draft
+        # se borraría por un error transitorio.
+        try:
+            cloud_head = self.shared.cloud.get_head_version(
+                allow_local_fallback=False, operation="draft-load"
+            )
+        except CloudOperationError as exc:
+            if exc.code not in ("config_missing", "config_invalid"):
+                self._send_cloud_error("draft-load", exc)
+                return
+            # Sin SharePoint configurado (modo offline) el HEAD es el del log local
+            cloud_head = self.shared.cloud.get_head_version()
+        except Exception as exc:
+            self._send_cloud_error("draft-load", exc)
+            return
         result = self.coordinator.load_draft(draft_id, cloud_head=cloud_head)
         status = result.get("status")
         
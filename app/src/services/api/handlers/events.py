@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
 from .base import BaseHandler
 from ..coordinators import CloudCoordinator, GraphCoordinator
+from ..coordinators.cloud_coordinator import InvalidVersionError
 from ..shared import PerfLogger
 from src.services.api.graph_snapshot import serialize_graph
 
@@ -55,7 +56,7 @@ class EventHistoryHandler(BaseHandler):
         if limit <= 0:
             limit = 50
 
-        events = self.shared.cloud.load_events()
+        events = self.shared.cloud.load_events_synced()
         total = len(events)
         page = events[offset : offset + limit]
 
@@ -157,9 +158,8 @@ class EventHistoryHandler(BaseHandler):
             version: Versión del grafo a obtener
         """
         try:
-            events = self.cloud_coordinator._load_event_objects()
-            events_upto = self.cloud_coordinator._events_upto_version(events, version)
-            graph = self.graph_coordinator.rebuild_from_events(events_upto)
+            events = self.cloud_coordinator._load_event_objects(upto_version=version)
+            graph = self.cloud_coordinator.rebuild_upto_version(events, version)
             graph_data = serialize_graph(graph)
             self._send_json(200, graph_data)
         except Exception as exc:
@@ -187,7 +187,7 @@ class EventHistoryHandler(BaseHandler):
 
             perf.log(
                 events_count=result.get("events_count", 0),
-                snapshot_bytes=self._json_size(result.get("snapshot", {})),
+                snapshot_bytes=result.get("snapshot_bytes", 0),
                 append_events=result.get("append_events", 0),
             )
             
@@ -199,6 +199,8 @@ class EventHistoryHandler(BaseHandler):
                     "head_previous": result["head_previous"],
                 },
             )
+        except InvalidVersionError as exc:
+            self._send_json(400, {"error": "invalid version", "head": exc.head})
         except Exception as exc:
             self._send_cloud_error("rebuild", exc)
     
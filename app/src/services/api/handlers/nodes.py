@@ -12,6 +12,7 @@ if TYPE_CHECKING:
     from http.server import BaseHTTPRequestHandler
 
 from .base import BaseHandler
+from src.services.api.graph_snapshot import serialize_node
 
 
 class NodeDetailsHandler(BaseHandler):
@@ -50,11 +51,9 @@ class NodeDetailsHandler(BaseHandler):
         self._send_json(404, {"status": "error", "error": {"kind": "not_found"}})
 
     def _get_snapshot_node(self, node_id: str) -> dict[str, Any] | None:
-        graph_data = self.shared.es.graph.to_data()
-        for node in graph_data.get("nodes", []):
-            if node.get("id") == node_id:
-                return dict(node)
-        return None
+        # Lookup directo por id: evita serializar el grafo completo para
+        # luego recorrer todos sus nodos buscando uno solo.
+        return serialize_node(self.shared.es.graph, node_id)
 
     def _get_component_cache(self, node_id: str) -> dict[str, Any] | None:
         cache = self.shared.local.load_components_cache()
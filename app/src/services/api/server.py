@@ -106,7 +106,9 @@ def _get_cloud_base_version_lazy(local: LocalWorkspaceStore, cloud: CloudClient)
     La sincronización con SharePoint se hace en background.
     """
     try:
-        return len(local.load_events())
+        # Sólo interesa el largo del log: se cuentan líneas sin parsear JSON
+        # para no retrasar el arranque del servidor.
+        return local.count_events()
     except Exception:
         return 0
 
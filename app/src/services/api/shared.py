@@ -6,15 +6,18 @@ from __future__ import annotations
 import json
 import sys
 import time
+from collections import OrderedDict, deque
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.model.eventsourcing.service import GraphES
+    from src.model.graph.graph import ReliabilityGraph
     from src.services.cache.local_store import LocalWorkspaceStore
     from src.services.remote.client import CloudClient
+    from src.services.evaluation import EvaluationService
 
 
 @dataclass
@@ -34,6 +37,13 @@ class SharedState:
     base_dir: str
     cloud_baseline: dict | None = None
     pending_cloud_op: PendingCloudOperation | None = None
+    # Grafos reconstruidos por versión (LRU), ver CloudCoordinator.rebuild_upto_version
+    rebuild_cache: OrderedDict[tuple, ReliabilityGraph] = field(default_factory=OrderedDict)
+    # Servicio de evaluación (cliente de fallas + sesión Graph) reutilizado entre requests
+    evaluation_service: EvaluationService | None = None
+    # Grafos descartados por undo: (evento deshecho, grafo previo, grafo resultante).
+    # Permiten que redo restaure el grafo sin reconstruir, ver GraphCoordinator.redo
+    redo_stash: deque[tuple] = field(default_factory=lambda: deque(maxlen=32))
 
 
 class PerfLogger:
@@ -89,6 +89,9 @@ class LocalWorkspaceStore:
     def load_events(self) -> List[dict]:
         return self.events.load_all()
 
+    def count_events(self) -> int:
+        return self.events.count()
+
     def append_events(self, events: List[dict]) -> int:
         self._validate_event_versions(events, context="append_events")
         return self.events.append_many(events or [])
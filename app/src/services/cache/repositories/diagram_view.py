@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .json import JsonRepo
 
@@ -12,18 +12,26 @@ class DiagramViewRepo:
     def __init__(self, data_dir: str):
         self.path = os.path.join(data_dir, "views", "diagram_view.json")
         self._repo = JsonRepo(path=self.path, add_saved_at=True)
+        # Último estado leído o escrito en disco
+        self._current: Optional[List[str]] = None
 
     def load(self) -> Dict[str, Any]:
         data = self._repo.load({})
         collapsed = data.get("collapsedGateIds", []) if isinstance(data, dict) else []
-        return {"collapsedGateIds": _normalize_ids(collapsed)}
+        ids = _normalize_ids(collapsed)
+        self._current = ids
+        return {"collapsedGateIds": list(ids)}
 
     def save(self, view: Dict[str, Any]) -> None:
         collapsed = []
         if isinstance(view, dict):
             collapsed = view.get("collapsedGateIds", [])
-        payload = {"collapsedGateIds": _normalize_ids(collapsed)}
-        self._repo.save(payload)
+        ids = _normalize_ids(collapsed)
+        # Un colapsar/expandir que no cambia el conjunto no reescribe el archivo
+        if ids == self._current:
+            return
+        self._repo.save({"collapsedGateIds": ids})
+        self._current = ids
 
 
 def _normalize_ids(values: Any) -> List[str]:
@@ -32,6 +32,20 @@ class JsonlRepo:
             return out
         return out
 
+    def count(self) -> int:
+        """Cantidad de objetos en el archivo sin parsear cada línea."""
+        n = 0
+        try:
+            if not os.path.exists(self.path):
+                return 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if line.lstrip().startswith(b"{"):
+                        n += 1
+        except Exception:
+            return n
+        return n
+
     def append_many(self, items: List[dict]) -> int:
         if not items:
             return 0
@@ -29,13 +29,7 @@ class EvaluationService:
         return cls(es=es, failures=failures, project_root=project_root)
 
     def _component_ids(self) -> list[str]:
-        return sorted(
-            [
-                node_id
-                for node_id, node in self.es.graph.nodes.items()
-                if node.is_component()
-            ]
-        )
+        return self.es.graph.component_ids()
 
     def ensure_failures(self) -> dict:
         return self.failures.ensure_min_records(self._component_ids(), None)
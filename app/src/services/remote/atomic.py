@@ -31,6 +31,9 @@ class CloudAtomicOperation:
         self._coordination_id: str | None = None
         self._committed = False
         self._events_committed = False
+        # Se intentó escribir eventos: aunque append_events falle, parte del
+        # rango puede haber quedado en SharePoint.
+        self._events_attempted = False
 
     def head_version(self) -> int:
         """Retorna la versión máxima en SharePoint."""
@@ -100,6 +103,7 @@ class CloudAtomicOperation:
         }
         self._snapshot_payload = snapshot
         
+        self._events_attempted = True
         count = self._sp_events.append_events(self._events_payload)
         if count != len(self._events_payload):
             raise RuntimeError(
@@ -233,8 +237,13 @@ class CloudAtomicOperation:
             self.cloud.local.append_events(self._events_payload)
 
     def rollback(self) -> None:
-        """Marca los eventos como ignorados si ya fueron escritos."""
-        if not self._events_payload or not self._events_committed:
+        """
+        Marca los eventos como ignorados si ya fueron (o pudieron ser) escritos.
+
+        Un append fallido puede dejar escrito un prefijo de los eventos sin que
+        append_events lo reporte; por eso se ignora el rango completo.
+        """
+        if not self._events_payload or not (self._events_committed or self._events_attempted):
             return
         if self._head_before is None:
             return
@@ -330,6 +330,106 @@ class CloudClient:
             update_local=update_fn if update_local else None,
         )
 
+    def get_head_version(
+        self,
+        *,
+        allow_local_fallback: bool = True,
+        operation: str = "cloud-head",
+    ) -> int:
+        """
+        Versión HEAD del log de eventos.
+
+        En SharePoint se consulta sólo el item con mayor versión (un GET con
+        $top=1) en lugar de descargar y contar el log completo. Igual que en
+        load_events, con allow_local_fallback=False la versión debe venir de
+        SharePoint: un fallo de lectura o la falta de configuración se
+        propagan como error en vez de responder con el log local.
+        """
+        sp = self._sp_events()
+
+        def local_fn():
+            events = self.local.load_events()
+            return self._max_local_version(events) or len(events)
+
+        if sp is None:
+            if not allow_local_fallback:
+                require_cloud_client(sp, operation)
+            return local_fn()
+
+        # read_max_version propaga los errores: así un fallo de SharePoint
+        # cae al log local en vez de reportar HEAD = 0.
+        return try_cloud_with_fallback(
+            operation,
+            sp.read_max_version,
+            local_fn,
+            allow_fallback=allow_local_fallback,
+        )
+
+    def load_events_synced(self, *, operation: str = "event-history") -> list[dict]:
+        """
+        Eventos para lectura (historial): usa la copia local del log si está
+        al día con SharePoint.
+
+        La copia local se reemplaza en cada cloud load y se extiende en cada
+        commit, así que funciona como read-model; comparar su versión máxima
+        con el HEAD remoto cuesta una consulta de un solo item en vez de
+        descargar el log completo. Si el remoto avanzó, se pide sólo la cola
+        desde la última versión local; si esa cola tiene huecos se recarga el
+        log completo. Si la consulta del HEAD falla se sirve la copia local.
+        """
+        sp = self._sp_events()
+        if sp is None:
+            return self.load_events(operation=operation)
+
+        local_events = self.local.load_events()
+        local_head = self._max_local_version(local_events) if local_events else None
+        if local_head:
+            try:
+                with operation_context(operation):
+                    head = sp.read_max_version()
+            except Exception:
+                # Mismo criterio que el fallback de load_events: si SharePoint
+                # no responde se sirve la copia local, sin una segunda descarga.
+                LOG.exception("Cloud operation %s failed, using local fallback", operation)
+                return local_events
+            if head == local_head:
+                return local_events
+            if head > local_head:
+                # Sólo faltan eventos nuevos: se descarga la cola
+                try:
+                    with operation_context(operation):
+                        tail = sp.load_events(from_version=local_head + 1)
+                except Exception as exc:
+                    LOG.warning("Incremental event sync failed, reloading full log: %s", exc)
+                    tail = []
+                versions = [ev.get("version") for ev in tail]
+                # La cola sólo se agrega si cubre local_head+1..head sin huecos
+                # (un append parcial puede dejar versiones sueltas en SharePoint).
+                if all(isinstance(v, int) for v in versions) and sorted(versions) == list(
+                    range(local_head + 1, head + 1)
+                ):
+                    self.local.append_events(tail)
+                    return local_events + tail
+                if tail:
+                    LOG.warning(
+                        "Event tail %s..%s is incomplete, reloading full log",
+                        local_head + 1,
+                        head,
+                    )
+
+        return self.load_events(operation=operation)
+
+    @staticmethod
+    def _max_local_version(events: list[dict]) -> int | None:
+        max_v = None
+        for ev in events:
+            if not isinstance(ev, dict):
+                continue
+            v = ev.get("version")
+            if isinstance(v, int) and (max_v is None or v > max_v):
+                max_v = v
+        return max_v
+
     def append_events(
         self,
         events: list[dict],
@@ -399,17 +499,29 @@ class CloudClient:
         self, version: int, offset: int, limit: int
     ) -> tuple[list[dict], int]:
         """Implementación local de búsqueda por versión."""
-        events = self.local.load_events()
-        filtered = []
-        for ev in events:
-            try:
-                if int(ev.get("version")) == int(version):
-                    filtered.append(ev)
-            except Exception:
-                continue
+        try:
+            target = int(version)
+        except (TypeError, ValueError):
+            return [], 0
+        filtered = [
+            ev
+            for ev in self.local.load_events()
+            if self._local_event_version(ev) == target
+        ]
         total = len(filtered)
         return filtered[offset : offset + limit], total
 
+    @staticmethod
+    def _local_event_version(event: dict) -> int | None:
+        """Versión entera de un evento local (None si no es convertible)."""
+        value = event.get("version")
+        if type(value) is int:
+            return value
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
     def search_events_by_kind(
         self,
         *,
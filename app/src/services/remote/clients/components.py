@@ -53,7 +53,7 @@ class SharePointComponentsClient:
         field_type_value: Optional[str] = None,
     ):
         self.settings = settings
-        self.session = GraphSession(settings)
+        self.session = GraphSession.shared(settings)
         self.resolver = SPResolver(self.session)
 
         self.components_list_id = components_list_id
@@ -69,6 +69,9 @@ class SharePointComponentsClient:
         self.field_subtype_value = field_subtype_value or f"{field_subtype}LookupValue"
         self.field_type_value = field_type_value or f"{field_type}LookupValue"
 
+        # Plantilla del filtro OData por id: se arma una vez por cliente
+        self._id_clause = f"fields/{field_id} eq '{{}}'"
+
         self._resolved_site_id: Optional[str] = None
         self._resolved_list_id: Optional[str] = None
         self._resolved_list_web_url: Optional[str] = None
@@ -319,19 +322,20 @@ class SharePointComponentsClient:
 
         out: Dict[str, Dict[str, Any]] = {}
 
+        path = f"sites/{site_id}/lists/{list_id}/items"
+        base_params = {
+            "$select": "id,eTag,lastModifiedDateTime,createdDateTime,fields",
+            "$expand": "fields",
+            "$top": "999",
+        }
+        clause = self._id_clause.format
+        escape = self._escape_odata
+
         n = max(1, int(chunk_size))
         for i in range(0, len(ids), n):
             batch = ids[i : i + n]
-            clauses = [f"fields/{self.field_id} eq '{self._escape_odata(cid)}'" for cid in batch]
-            odata_filter = " or ".join(clauses)
-
-            path = f"sites/{site_id}/lists/{list_id}/items"
-            params = {
-                "$select": "id,eTag,lastModifiedDateTime,createdDateTime,fields",
-                "$expand": "fields",
-                "$filter": odata_filter,
-                "$top": "999",
-            }
+            odata_filter = " or ".join([clause(escape(cid)) for cid in batch])
+            params = {**base_params, "$filter": odata_filter}
 
             data = self._get_json_any(path, params=params)
             while True:
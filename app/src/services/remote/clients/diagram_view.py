@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import json
 import os
 from typing import Optional
 
 from ..settings import SPSettings, load_settings
-from ..graph_session import GraphSession, GraphError
+from ..graph_session import GraphSession, GraphError, dumps_json_bytes
 from ..resolver import SPResolver
 
 
@@ -21,7 +20,7 @@ class SharePointDiagramViewClient:
         view_filename: str = "diagram_view.global.json",
     ) -> None:
         self.settings = settings
-        self.session = GraphSession(settings)
+        self.session = GraphSession.shared(settings)
         self.resolver = SPResolver(self.session)
 
         self.views_library_id = views_library_id or settings.events.snapshots_library_id
@@ -82,7 +81,7 @@ class SharePointDiagramViewClient:
         drive_id = self._resolve_drive_id()
         fname = self.view_filename
         path = f"sites/{site_id}/drives/{drive_id}/root:/{fname}:/content"
-        payload = json.dumps(view or {}, ensure_ascii=False).encode("utf-8")
+        payload = dumps_json_bytes(view or {})
         self.session.put_bytes(path, payload, content_type="application/json")
 
     def delete_global_view(self) -> bool:
@@ -5,7 +5,7 @@ import time
 from typing import Any, Optional
 
 from ..settings import SPSettings, load_settings
-from ..graph_session import GraphSession, GraphError
+from ..graph_session import GraphSession, GraphError, dumps_json_bytes, loads_json
 from ..resolver import SPResolver
 
 from ....model.eventsourcing.events import event_from_dict
@@ -31,7 +31,7 @@ class SharePointEventsClient:
         snapshot_threshold_bytes: int = 100 * 1024,
     ):
         self.settings = settings
-        self.session = GraphSession(settings)
+        self.session = GraphSession.shared(settings)
         self.resolver = SPResolver(self.session)
 
         self.events_list_id = events_list_id
@@ -47,6 +47,17 @@ class SharePointEventsClient:
         self.field_payload = field_payload
         self.field_snapshot_file = field_snapshot_file
 
+        # (clave del evento, columna SharePoint) copiadas tal cual por fila
+        self._row_fields: tuple[tuple[str, str], ...] = tuple(
+            (key, name)
+            for key, name in (
+                ("kind", field_kind),
+                ("ts", field_ts),
+                ("actor", field_actor),
+            )
+            if name
+        )
+
         try:
             self.snapshot_threshold_bytes = max(1024, int(snapshot_threshold_bytes))
         except Exception:
@@ -153,7 +164,7 @@ class SharePointEventsClient:
         fname = f"event_snapshot_{safe_ts}_v{safe_v}.json"
 
         path = f"sites/{site_id}/drives/{drive_id}/root:/{fname}:/content"
-        payload = json.dumps(data or {}, ensure_ascii=False).encode("utf-8")
+        payload = dumps_json_bytes(data or {})
         res = self.session.put_bytes(path, payload, content_type="application/json")
 
         # guardamos el nombre usado como referencia (compat con tu lógica actual)
@@ -260,32 +271,39 @@ class SharePointEventsClient:
     
     # ---------------- public API ----------------
 
-    def get_max_version(self) -> int:
+    def read_max_version(self) -> int:
+        """
+        Versión máxima del log (0 si está vacío). A diferencia de
+        get_max_version, propaga los errores de SharePoint/auth para que el
+        llamador pueda distinguir "log vacío" de "no se pudo leer".
+        """
         if not self.field_version:
             return 0
 
+        site_id = self._resolve_site_id()
+        list_id = self._resolve_events_list_id()
+        params = {
+            "$orderby": f"fields/{self.field_version} desc",
+            "$top": "1",
+            "$expand": "fields",
+        }
+        path = f"sites/{site_id}/lists/{list_id}/items"
+        data = self.session.request_json("GET", path, params=params)
+        items = data.get("value", []) if isinstance(data, dict) else []
+        if not items:
+            return 0
+        fields = (items[0] or {}).get("fields") or {}
+        value = fields.get(self.field_version)
+        if value is None:
+            return 0
         try:
-            site_id = self._resolve_site_id()
-            list_id = self._resolve_events_list_id()
-            params = {
-                "$orderby": f"fields/{self.field_version} desc",
-                "$top": "1",
-                "$expand": "fields",
-            }
-            path = f"sites/{site_id}/lists/{list_id}/items"
-            data = self.session.request_json("GET", path, params=params)
-            items = data.get("value", []) if isinstance(data, dict) else []
-            if not items:
-                return 0
-            fields = (items[0] or {}).get("fields") or {}
-            value = fields.get(self.field_version)
-            if value is None:
-                return 0
-            try:
-                int_version = int(value)
-                return int_version
-            except Exception:
-                return 0
+            return int(value)
+        except Exception:
+            return 0
+
+    def get_max_version(self) -> int:
+        try:
+            return self.read_max_version()
         except Exception:
             return 0
 
@@ -293,70 +311,78 @@ class SharePointEventsClient:
         if not events:
             return 0
 
+        prepared = [ev for ev in (self._event_to_dict(raw) for raw in events) if ev]
+        if not prepared:
+            return 0
+
+        # Los POST van en orden de versión y se detienen en el primer fallo:
+        # el log en SharePoint nunca queda con huecos, sólo con un prefijo
+        # escrito (el llamador ignora el rango, ver CloudAtomicOperation).
+        # Los ids de sitio/lista se resuelven una vez antes del loop.
+        self._resolve_site_id()
+        self._resolve_events_list_id()
         done = 0
-        for raw in events:
-            ev = self._event_to_dict(raw)
-            if not ev:
-                continue
-
-            snapshot_ref: Optional[str] = None
-            payload_for_list: dict = dict(ev)
-            payload_text: str = ""
-
-            if ev.get("kind") == "snapshot":
-                data_obj = ev.get("data") or {}
-                if self._has_snapshot_library():
-                    try:
-                        snapshot_ref = self._upload_snapshot_to_library(
-                            data_obj,
-                            ev.get("version"),
-                            ev.get("ts"),
-                        )
-                        payload_for_list = {k: v for k, v in ev.items() if k != "data"}
-                        payload_text = json.dumps(payload_for_list, ensure_ascii=False)
-                    except Exception:
-                        snapshot_ref = None
-
-                if snapshot_ref is None:
-                    try:
-                        payload_text = json.dumps(payload_for_list, ensure_ascii=False)
-                    except Exception:
-                        payload_text = ""
+        for ev in prepared:
+            self._append_one(ev)
+            done += 1
+        return done
 
-            else:
+    def _append_one(self, ev: dict) -> None:
+        snapshot_ref: Optional[str] = None
+        payload_for_list: dict = dict(ev)
+        payload_text: str = ""
+
+        if ev.get("kind") == "snapshot":
+            data_obj = ev.get("data") or {}
+            if self._has_snapshot_library():
                 try:
+                    snapshot_ref = self._upload_snapshot_to_library(
+                        data_obj,
+                        ev.get("version"),
+                        ev.get("ts"),
+                    )
+                    payload_for_list = {k: v for k, v in ev.items() if k != "data"}
                     payload_text = json.dumps(payload_for_list, ensure_ascii=False)
                 except Exception:
-                    payload_text = ""
+                    snapshot_ref = None
 
-            fields = {}
-            if self.field_kind:
-                fields[self.field_kind] = ev.get("kind")
-            if self.field_ts:
-                fields[self.field_ts] = ev.get("ts")
-            if self.field_actor:
-                fields[self.field_actor] = ev.get("actor")
-            if self.field_version and ev.get("version") is not None:
+            if snapshot_ref is None:
                 try:
-                    fields[self.field_version] = int(ev.get("version"))
+                    payload_text = json.dumps(payload_for_list, ensure_ascii=False)
                 except Exception:
-                    fields[self.field_version] = ev.get("version")
-            if self.field_payload:
-                fields[self.field_payload] = payload_text
-            if snapshot_ref and self.field_snapshot_file:
-                fields[self.field_snapshot_file] = snapshot_ref
+                    payload_text = ""
 
-            self._post_event_fields(fields)
-            done += 1
+        else:
+            try:
+                payload_text = json.dumps(payload_for_list, ensure_ascii=False)
+            except Exception:
+                payload_text = ""
+
+        fields = {}
+        if self.field_kind:
+            fields[self.field_kind] = ev.get("kind")
+        if self.field_ts:
+            fields[self.field_ts] = ev.get("ts")
+        if self.field_actor:
+            fields[self.field_actor] = ev.get("actor")
+        if self.field_version and ev.get("version") is not None:
+            try:
+                fields[self.field_version] = int(ev.get("version"))
+            except Exception:
+                fields[self.field_version] = ev.get("version")
+        if self.field_payload:
+            fields[self.field_payload] = payload_text
+        if snapshot_ref and self.field_snapshot_file:
+            fields[self.field_snapshot_file] = snapshot_ref
 
-        return done
+        self._post_event_fields(fields)
 
     def _build_event_dict(self, fields: dict) -> Optional[dict]:
         payload_raw = fields.get(self.field_payload) or ""
         payload_dict = {}
         if payload_raw:
             try:
-                payload_dict = json.loads(payload_raw)
+                payload_dict = loads_json(payload_raw)
             except Exception as e:
                 print(f"[_build_event_dict] Failed to parse payload JSON: {e}")
                 payload_dict = {}
@@ -364,17 +390,17 @@ class SharePointEventsClient:
         ev = dict(payload_dict or {})
         ev["payload"] = payload_raw
 
-        if self.field_kind and fields.get(self.field_kind) is not None:
-            ev["kind"] = fields.get(self.field_kind)
-        if self.field_ts and fields.get(self.field_ts) is not None:
-            ev["ts"] = fields.get(self.field_ts)
-        if self.field_actor and fields.get(self.field_actor) is not None:
-            ev["actor"] = fields.get(self.field_actor)
-        if self.field_version and fields.get(self.field_version) is not None:
-            try:
-                ev["version"] = int(fields.get(self.field_version))
-            except Exception:
-                ev["version"] = fields.get(self.field_version)
+        for key, name in self._row_fields:
+            value = fields.get(name)
+            if value is not None:
+                ev[key] = value
+        if self.field_version:
+            version = fields.get(self.field_version)
+            if version is not None:
+                try:
+                    ev["version"] = int(version)
+                except (TypeError, ValueError):
+                    ev["version"] = version
 
         doc_ref = fields.get(self.field_snapshot_file)
         if doc_ref:
@@ -24,7 +24,7 @@ class SharePointFailuresClient:
         field_type: Optional[str] = None,
     ):
         self.settings = settings
-        self.session = GraphSession(settings)
+        self.session = GraphSession.shared(settings)
         self.resolver = SPResolver(self.session)
 
         # Permite override; si no, toma defaults desde settings.failures
@@ -35,6 +35,10 @@ class SharePointFailuresClient:
         self.field_date = field_date or settings.failures.field_date
         self.field_type = field_type or settings.failures.field_type
 
+        # Partes fijas de la consulta OData: se arman una vez por cliente
+        self._component_clause = f"fields/{self.field_component} eq '{{}}'"
+        self._fields_expand = f"fields($select={self.field_component},{self.field_date},{self.field_type})"
+
         # cache interno
         self._resolved_list_id: Optional[str] = None
 
@@ -92,17 +96,17 @@ class SharePointFailuresClient:
         rows: list[dict] = []
         safe_top = str(min(max(1, int(top)), 999))
 
+        path = f"sites/{site_id}/lists/{list_id}/items"
+        base_params = {
+            "$select": "id,fields",
+            "$expand": self._fields_expand,
+            "$top": safe_top,
+        }
+        clause = self._component_clause.format
+
         for batch in self._chunk(comp_ids, chunk_size):
-            clauses = [f"fields/{fcomp} eq '{escape_odata_literal(cid)}'" for cid in batch]
-            odata_filter = " or ".join(clauses)
-
-            path = f"sites/{site_id}/lists/{list_id}/items"
-            params = {
-                "$select": "id,fields",
-                "$expand": f"fields($select={fcomp},{fdate},{ftype})",
-                "$filter": odata_filter,
-                "$top": safe_top,
-            }
+            odata_filter = " or ".join([clause(escape_odata_literal(cid)) for cid in batch])
+            params = {**base_params, "$filter": odata_filter}
 
             data = self.session.get_json(path, params=params)
 
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import json
 import os
 from typing import Optional
 
 from ..settings import SPSettings, load_settings
-from ..graph_session import GraphSession, GraphError
+from ..graph_session import GraphSession, GraphError, dumps_json_bytes
 from ..resolver import SPResolver
 
 
@@ -25,7 +24,7 @@ class SharePointSnapshotClient:
         snapshot_filename: str = "snapshot_global.json",
     ):
         self.settings = settings
-        self.session = GraphSession(settings)
+        self.session = GraphSession.shared(settings)
         self.resolver = SPResolver(self.session)
 
         # Drive (library) donde vive el snapshot
@@ -76,7 +75,7 @@ class SharePointSnapshotClient:
 
         # PUT content al archivo
         path = f"sites/{site_id}/drives/{drive_id}/root:/{fname}:/content"
-        payload = json.dumps(snapshot or {}, ensure_ascii=False).encode("utf-8")
+        payload = dumps_json_bytes(snapshot or {})
         self.session.put_bytes(path, payload, content_type="application/json")
 
     def load_snapshot(self) -> dict:
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
-from .graph_session import GraphError, RequestException
+from .graph_session import GraphError, is_request_exception
 
 
 CLOUD_ERROR_MESSAGES = {
@@ -50,7 +50,7 @@ def _is_retryable_cloud_exception(exc: Exception) -> bool:
         if exc.status_code >= 500:
             return True
         return False
-    if isinstance(exc, RequestException):
+    if is_request_exception(exc):
         return True
     if isinstance(exc, TimeoutError):
         return True
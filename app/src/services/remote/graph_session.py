@@ -2,18 +2,18 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import os
+import sys
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
 try:
-    import requests
-    from requests import RequestException
+    import orjson
 except Exception:
-    requests = None  # type: ignore
-    class RequestException(Exception):
-        pass
+    orjson = None  # type: ignore
 
 from .settings import SPSettings
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
@@ -36,6 +36,70 @@ class GraphError(RuntimeError):
         return f"Graph request failed: {self.status_code} {self.url} {tail}"
 
 
+def _has_non_finite(obj: Any) -> bool:
+    """True si `obj` contiene algún float NaN/Infinity (a cualquier profundidad)."""
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, float):
+            if not math.isfinite(cur):
+                return True
+        elif isinstance(cur, dict):
+            stack.extend(cur.values())
+        elif isinstance(cur, (list, tuple)):
+            stack.extend(cur)
+    return False
+
+
+def dumps_json_bytes(obj: Any) -> bytes:
+    """
+    Serializa a JSON UTF-8 para subir a SharePoint.
+
+    Usa orjson si está instalado (encoder en C); si no, json estándar con
+    separadores compactos. orjson escribe NaN/Infinity como null, así que si
+    hay floats no finitos se usa json estándar para guardarlos tal cual.
+    """
+    if orjson is not None and not _has_non_finite(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(raw: str | bytes) -> Any:
+    """
+    Parsea JSON con orjson si está disponible. Si orjson lo rechaza se
+    reintenta con json estándar, que acepta NaN/Infinity (los payloads
+    escritos con json.dumps pueden traerlos).
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _load_requests():
+    """
+    Importa requests bajo demanda: arrastra urllib3, certifi y ssl, y no hace
+    falta para levantar el servidor (los clientes SP se crean en background).
+    """
+    try:
+        import requests
+    except Exception:
+        return None
+    return requests
+
+
+def is_request_exception(exc: BaseException) -> bool:
+    """True si `exc` es un error de red de requests."""
+    # Si requests nunca se importó, ninguna excepción puede venir de ahí.
+    mod = sys.modules.get("requests.exceptions")
+    return mod is not None and isinstance(exc, mod.RequestException)
+
+
 def _is_retryable_graph_error(exc: Exception) -> bool:
     if isinstance(exc, GraphError):
         if exc.status_code in (408, 429):
@@ -43,7 +107,7 @@ def _is_retryable_graph_error(exc: Exception) -> bool:
         if exc.status_code >= 500:
             return True
         return False
-    if isinstance(exc, RequestException):
+    if is_request_exception(exc):
         return True
     if isinstance(exc, TimeoutError):
         return True
@@ -71,6 +135,10 @@ def _sharepoint_retry():
     )
 
 
+_SHARED_SESSIONS: dict[tuple, "GraphSession"] = {}
+_SHARED_SESSIONS_LOCK = threading.Lock()
+
+
 class GraphSession:
     """
     Sesión para Microsoft Graph:
@@ -80,13 +148,38 @@ class GraphSession:
     """
 
     def __init__(self, settings: SPSettings):
+        requests = _load_requests()
         if requests is None:
             raise RuntimeError("Missing dependency: requests")
         self.s = settings
         self._token: Optional[str] = None
         self._token_exp_ts: float = 0.0
+        self._token_lock = threading.Lock()
         self._http = requests.Session()
 
+    @classmethod
+    def shared(cls, settings: SPSettings) -> "GraphSession":
+        """
+        Sesión compartida por credenciales: los clientes SP (eventos, snapshot,
+        componentes, ...) reutilizan el mismo pool de conexiones y el mismo
+        token en vez de negociar TLS y pedir un token cada uno.
+        """
+        key = (
+            settings.tenant_id,
+            settings.client_id,
+            settings.client_secret,
+            settings.scope,
+            settings.graph_base,
+            settings.timeout_s,
+            settings.site,
+        )
+        with _SHARED_SESSIONS_LOCK:
+            session = _SHARED_SESSIONS.get(key)
+            if session is None:
+                session = cls(settings)
+                _SHARED_SESSIONS[key] = session
+            return session
+
     def _token_url(self) -> str:
         return f"https://login.microsoftonline.com/{self.s.tenant_id}/oauth2/v2.0/token"
 
@@ -95,6 +188,15 @@ class GraphSession:
         if self._token and now < (self._token_exp_ts - 60):
             return self._token
 
+        # La sesión puede usarse desde varios hilos (cargas/appends en
+        # paralelo): sólo uno pide el token, el resto reutiliza el resultado.
+        with self._token_lock:
+            now = time.time()
+            if self._token and now < (self._token_exp_ts - 60):
+                return self._token
+            return self._fetch_token(now)
+
+    def _fetch_token(self, now: float) -> str:
         data = {
             "client_id": self.s.client_id,
             "client_secret": self.s.client_secret,
@@ -288,7 +390,7 @@ class GraphSession:
         return r.json() if r.text else {}
 
     def put_json(self, url_or_path: str, obj: Any) -> dict:
-        raw = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        raw = dumps_json_bytes(obj)
         return self.put_bytes(url_or_path, raw, content_type="application/json")
 
     @_sharepoint_retry()
@@ -1,18 +1,42 @@
 import argparse
+import hashlib
 import json
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import re
 
+_REGION_RE = re.compile(r"Only valid regions are\s+([A-Z, ]+)")
+REGION_CACHE_TTL_S = 7 * 24 * 3600
+
+
 def discover_region(session, tenant_hostname: str) -> str:
     """
+    0) Reuse the region cached for this tenant (7-day TTL).
     1) Try /beta/sites?filter=siteCollection/root ne null&select=webUrl,siteCollection
     2) If empty/missing, probe /beta/search/query with an invalid region and parse the error message.
     """
+    host_key = tenant_hostname.lower()
+    cache = read_cache("regions.json")
+    entry = cache.get(host_key) or {}
+    if entry.get("region") and time.time() - float(entry.get("ts") or 0) < REGION_CACHE_TTL_S:
+        return entry["region"]
+
+    region = _probe_region(session, host_key)
+    cache[host_key] = {"region": region, "ts": time.time()}
+    write_cache("regions.json", cache)
+    return region
+
+
+def _probe_region(session, tenant_hostname: str) -> str:
     # 1) Try multi-geo discovery endpoint (works for multi-geo; in single-geo may return empty "")
     url = f"{GRAPH_BETA}/sites"
     params = {
@@ -23,7 +47,7 @@ def discover_region(session, tenant_hostname: str) -> str:
     data = session.get(url, params=params, timeout=60).json()
     for s in data.get("value", []) or []:
         sc = s.get("siteCollection") or {}
-        if (sc.get("hostname") or "").lower() == tenant_hostname.lower():
+        if (sc.get("hostname") or "").lower() == tenant_hostname:
             code = (sc.get("dataLocationCode") or "").strip()
             if code:
                 return code  # e.g., NAM/EUR/APC...
@@ -46,7 +70,7 @@ def discover_region(session, tenant_hostname: str) -> str:
     except Exception:
         msg = r.text or ""
 
-    m = re.search(r"Only valid regions are\s+([A-Z, ]+)", msg)
+    m = _REGION_RE.search(msg)
     if not m:
         raise RuntimeError(
             "No pude autodetectar region. "
@@ -60,13 +84,63 @@ def discover_region(session, tenant_hostname: str) -> str:
 GRAPH_V1 = "https://graph.microsoft.com/v1.0"
 GRAPH_BETA = "https://graph.microsoft.com/beta"
 
+# $batch accepts at most 20 subrequests; batches are sent concurrently.
+BATCH_SIZE = 20
+BATCH_WORKERS = 8
+MAX_THROTTLE_RETRIES = 3
+
+# Slow resolution steps (list ids, ...) are cached between CLI runs.
+CACHE_DIR = Path.home() / ".cache" / "blocon"
+
+
+def read_cache(name: str) -> Dict[str, Any]:
+    try:
+        with (CACHE_DIR / name).open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_cache(name: str, data: Dict[str, Any], private: bool = False) -> None:
+    """Write atomically so an interrupted run never leaves a truncated cache.
+
+    private=True creates the file readable by the owner only (0600).
+    """
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = CACHE_DIR / name
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600 if private else 0o644)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
 
 def die(msg: str, code: int = 1) -> None:
     print(msg, file=sys.stderr)
     raise SystemExit(code)
 
 
-def get_token_client_credentials(tenant_id: str, client_id: str, client_secret: str) -> str:
+def get_token_client_credentials(
+    tenant_id: str,
+    client_id: str,
+    client_secret: str,
+    session: Optional[requests.Session] = None,
+) -> str:
+    """App-only token, reused from the disk cache until one minute before it expires.
+
+    Pass the Graph session to fetch it over the same pooled connections.
+    """
+    client_hash = hashlib.sha256(client_id.encode()).hexdigest()[:12]
+    cache_name = f"msgraph_token_{tenant_id}_{client_hash}.json"
+    cached = read_cache(cache_name)
+    token = cached.get("access_token")
+    if token and time.time() < float(cached.get("exp_epoch") or 0) - 60:
+        return token
+
     token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
     data = {
         "client_id": client_id,
@@ -74,10 +148,15 @@ def get_token_client_credentials(tenant_id: str, client_id: str, client_secret:
         "grant_type": "client_credentials",
         "scope": "https://graph.microsoft.com/.default",
     }
-    r = requests.post(token_url, data=data, timeout=60)
+    post = session.post if session is not None else requests.post
+    r = post(token_url, data=data, timeout=60)
     if r.status_code != 200:
         die(f"Token request failed ({r.status_code}): {r.text}")
-    return r.json()["access_token"]
+    payload = r.json()
+    token = payload["access_token"]
+    exp_epoch = time.time() + float(payload.get("expires_in") or 0)
+    write_cache(cache_name, {"access_token": token, "exp_epoch": exp_epoch}, private=True)
+    return token
 
 
 def graph_get(session: requests.Session, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
@@ -87,30 +166,42 @@ def graph_get(session: requests.Session, url: str, params: Optional[Dict[str, st
     return r.json()
 
 
+def new_graph_session(token: Optional[str] = None) -> requests.Session:
+    """Session whose connection pool is large enough for concurrent $batch calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("https://graph.microsoft.com", adapter)
+    session.headers["Accept"] = "application/json"
+    if token:
+        session.headers["Authorization"] = f"Bearer {token}"
+    return session
+
+
 def graph_post(session: requests.Session, url: str, body: Dict[str, Any]) -> Dict[str, Any]:
     r = session.post(url, json=body, timeout=60)
+    for _ in range(MAX_THROTTLE_RETRIES):
+        if r.status_code != 429:
+            break
+        # Graph throttling: honor Retry-After before retrying.
+        try:
+            wait_s = float(r.headers.get("Retry-After", "1"))
+        except ValueError:
+            wait_s = 1.0
+        time.sleep(wait_s)
+        r = session.post(url, json=body, timeout=60)
     if r.status_code >= 400:
         die(f"POST {url} failed ({r.status_code}): {r.text}")
     return r.json()
 
 
-def resolve_site(session: requests.Session, site_url: str) -> Tuple[str, str]:
-    """Resolve a SharePoint site URL into (site_id, region=dataLocationCode).
-
-    Notes:
-    - Microsoft Search API with application permissions requires a 'region' value.
-    - In single-geo tenants, Microsoft Graph can return siteCollection.dataLocationCode as an empty string,
-      so we DO NOT fail if it's missing; caller can fall back to discover_region().
-    """
+def _site_path(site_url: str) -> Tuple[str, str]:
     u = urlparse(site_url)
     if not u.scheme or not u.netloc or not u.path:
         die(f"Invalid --site-url: {site_url}")
+    return u.netloc, u.path.rstrip("/")  # e.g. /sites/gemeherramientas
 
-    hostname = u.netloc
-    path = u.path.rstrip("/")  # e.g. /sites/gemeherramientas
 
-    url = f"{GRAPH_V1}/sites/{hostname}:{path}"
-    site = graph_get(session, url, params={"$select": "id,webUrl,siteCollection"})
+def _site_id_and_region(site: Dict[str, Any], site_url: str) -> Tuple[str, str]:
     site_id = site.get("id")
     if not site_id:
         die(f"Could not resolve site id from {site_url}: {site}")
@@ -118,20 +209,93 @@ def resolve_site(session: requests.Session, site_url: str) -> Tuple[str, str]:
     sc = site.get("siteCollection") or {}
     region = (sc.get("dataLocationCode") or "").strip()  # may be "" in single-geo tenants
     return site_id, region
-def resolve_list_id(session: requests.Session, site_id: str, list_title: str) -> str:
-    # List all lists and match by displayName (safe and simple)
-    url = f"{GRAPH_V1}/sites/{site_id}/lists"
-    data = graph_get(session, url, params={"$select": "id,displayName", "$top": "200"})
-    for lst in data.get("value", []):
-        if (lst.get("displayName") or "").lower() == list_title.lower():
-            return lst["id"]
-    die(f'List "{list_title}" not found in site {site_id}. Got: {[l.get("displayName") for l in data.get("value", [])]}')
-
-def resolve_list_weburl(session: requests.Session, site_id: str, list_id: str) -> str:
-    """Get the list webUrl (used to scope Search API results with Path: KQL)."""
-    url = f"{GRAPH_V1}/sites/{site_id}/lists/{list_id}"
-    lst = graph_get(session, url, params={"$select": "webUrl"})
-    return (lst.get("webUrl") or "").rstrip("/")
+
+
+def resolve_site_and_lists(
+    session: requests.Session, site_url: str
+) -> Tuple[str, str, Optional[List[Dict[str, Any]]]]:
+    """Resolve a SharePoint site URL into (site_id, region=dataLocationCode) and
+    fetch the site lists in the same $batch round-trip.
+
+    Notes:
+    - Microsoft Search API with application permissions requires a 'region' value.
+    - In single-geo tenants, Microsoft Graph can return siteCollection.dataLocationCode as an empty string,
+      so we DO NOT fail if it's missing; caller can fall back to discover_region().
+
+    Both subrequests address the site by path, so neither depends on the other.
+    Returns (site_id, region, lists); lists is None if that subrequest failed,
+    in which case resolve_list fetches them itself.
+    """
+    hostname, path = _site_path(site_url)
+    base = f"/sites/{hostname}:{path}"
+    body = {
+        "requests": [
+            {"id": "site", "method": "GET", "url": f"{base}?$select=id,webUrl,siteCollection"},
+            {"id": "lists", "method": "GET", "url": f"{base}:/lists?$select=id,displayName,webUrl&$top=200"},
+        ]
+    }
+    resp = graph_post(session, f"{GRAPH_V1}/$batch", body)
+    by_id = {r.get("id"): r for r in resp.get("responses", []) or []}
+
+    site_r = by_id.get("site") or {}
+    if site_r.get("status", 0) >= 400:
+        die(f"GET {base} failed ({site_r.get('status')}): {site_r.get('body')}")
+    site_id, region = _site_id_and_region(site_r.get("body") or {}, site_url)
+
+    lists_r = by_id.get("lists") or {}
+    lists = None
+    if 0 < lists_r.get("status", 0) < 400:
+        lists = (lists_r.get("body") or {}).get("value", [])
+    return site_id, region, lists
+
+
+def resolve_list(
+    session: requests.Session,
+    site_id: str,
+    list_title: str,
+    lists: Optional[List[Dict[str, Any]]] = None,
+    refresh: bool = False,
+) -> Tuple[str, str]:
+    """Match the list by displayName (case-insensitive) -> (list_id, webUrl).
+
+    When `lists` is given (e.g. prefetched in the site $batch) it is the source
+    of truth and refreshes the on-disk cache. Otherwise the cached
+    name -> {id, webUrl} map of the site is tried before asking Graph.
+    """
+    title = list_title.lower()
+    cache = read_cache("list_ids.json")
+    if lists is None and not refresh:
+        entry = (cache.get(site_id) or {}).get(title)
+        if isinstance(entry, dict) and entry.get("id"):
+            return entry["id"], entry.get("webUrl") or ""
+
+    if lists is None:
+        url = f"{GRAPH_V1}/sites/{site_id}/lists"
+        data = graph_get(session, url, params={"$select": "id,displayName,webUrl", "$top": "200"})
+        lists = data.get("value", [])
+    by_name = {
+        (l.get("displayName") or "").lower(): {"id": l["id"], "webUrl": (l.get("webUrl") or "").rstrip("/")}
+        for l in lists
+        if l.get("id")
+    }
+    cache[site_id] = by_name
+    write_cache("list_ids.json", cache)
+
+    entry = by_name.get(title)
+    if not entry:
+        die(f'List "{list_title}" not found in site {site_id}. Got: {[l.get("displayName") for l in lists]}')
+    return entry["id"], entry["webUrl"]
+
+
+def kql_phrase(value: str, prefix: bool = False) -> str:
+    """
+    Quote a user value as a KQL phrase. KQL has no escape for '"' inside a
+    phrase, so quotes are dropped; prefix=True appends the trailing wildcard.
+    """
+    text = value.replace('"', "").strip()
+    if prefix and not text.endswith("*"):
+        text += "*"
+    return f'"{text}"'
 
 
 def extract_search_hits(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -154,18 +318,49 @@ def extract_search_hits(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
     return hits
 
 
-def get_sp_ids_from_hit(hit: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+def get_fields_from_hit(hit: Dict[str, Any], select_fields: List[str]) -> Optional[Dict[str, Any]]:
     """
-    Returns (siteId, listId, listItemId)
+    Returns the requested listItem fields embedded in a search hit (when the
+    search request asked for "fields"), or None if any of them is missing.
+    Search may return field names with different casing.
     """
-    res = hit.get("resource") or {}
-    parent = res.get("parentReference") or {}
-    site_id = parent.get("siteId")
+    fields = (hit.get("resource") or {}).get("fields")
+    if not isinstance(fields, dict):
+        return None
+    by_lower = {str(k).lower(): v for k, v in fields.items()}
+    out: Dict[str, Any] = {}
+    for name in select_fields:
+        if name.lower() not in by_lower:
+            return None
+        out[name] = by_lower[name.lower()]
+    return out
 
-    sp = res.get("sharepointIds") or parent.get("sharepointIds") or {}
-    list_id = sp.get("listId")
-    list_item_id = sp.get("listItemId")
-    return site_id, list_id, list_item_id
+
+def filter_list_hits(
+    hits: List[Dict[str, Any]], site_id: str, list_id: str
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Returns (hits, listItemIds) restricted to the given site/list.
+    The listItemId/listId come from resource.sharepointIds (or the parent's);
+    hits from another site are dropped when parentReference.siteId is present.
+    """
+    filtered: List[Dict[str, Any]] = []
+    item_ids: List[str] = []
+    keep = filtered.append
+    add_id = item_ids.append
+    for h in hits:
+        res = h.get("resource") or {}
+        parent = res.get("parentReference") or {}
+        sp = res.get("sharepointIds") or parent.get("sharepointIds") or {}
+        item_id = sp.get("listItemId")
+        if not item_id or sp.get("listId") != list_id:
+            continue
+        h_site_id = parent.get("siteId")
+        if h_site_id and h_site_id != site_id:
+            continue
+        keep(h)
+        add_id(str(item_id))
+    return filtered, item_ids
 
 
 def batch_get_listitem_fields(
@@ -177,7 +372,7 @@ def batch_get_listitem_fields(
 ) -> Dict[str, Dict[str, Any]]:
     """
     Returns dict: item_id -> fields dict (Graph listItem.fields)
-    Uses $batch in chunks of 20.
+    Uses $batch in chunks of 20, sent concurrently.
     """
     out: Dict[str, Dict[str, Any]] = {}
     if not item_ids:
@@ -186,29 +381,39 @@ def batch_get_listitem_fields(
     def chunks(xs: List[str], n: int) -> List[List[str]]:
         return [xs[i : i + n] for i in range(0, len(xs), n)]
 
-    for batch_ids in chunks(item_ids, 20):
+    sel = ",".join(select_fields)
+
+    def build(batch_ids: List[str]) -> Dict[str, Any]:
         requests_body = []
         for idx, item_id in enumerate(batch_ids, start=1):
             # /sites/{site_id}/lists/{list_id}/items/{item_id}?$expand=fields($select=...)
-            sel = ",".join(select_fields)
             rel = f"/sites/{site_id}/lists/{list_id}/items/{item_id}?$expand=fields($select={sel})"
             requests_body.append({"id": str(idx), "method": "GET", "url": rel})
-
-        body = {"requests": requests_body}
-        resp = graph_post(session, f"{GRAPH_V1}/$batch", body)
-        for r in resp.get("responses", []) or []:
-            status = r.get("status", 0)
-            body_json = r.get("body") or {}
-            # Map response back to item_id by position
-            try:
-                pos = int(r["id"]) - 1
-                item_id = batch_ids[pos]
-            except Exception:
-                continue
-            if status >= 400:
-                out[item_id] = {"__error__": body_json}
-            else:
-                out[item_id] = (body_json.get("fields") or {})
+        return {"requests": requests_body}
+
+    # Each batch is an independent POST: submit them all and merge
+    # responses as they complete.
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as ex:
+        futs = {
+            ex.submit(graph_post, session, f"{GRAPH_V1}/$batch", build(batch_ids)): batch_ids
+            for batch_ids in chunks(item_ids, BATCH_SIZE)
+        }
+        for fut in as_completed(futs):
+            batch_ids = futs[fut]
+            resp = fut.result()
+            for r in resp.get("responses", []) or []:
+                status = r.get("status", 0)
+                body_json = r.get("body") or {}
+                # Map response back to item_id by position
+                try:
+                    pos = int(r["id"]) - 1
+                    item_id = batch_ids[pos]
+                except Exception:
+                    continue
+                if status >= 400:
+                    out[item_id] = {"__error__": body_json}
+                else:
+                    out[item_id] = (body_json.get("fields") or {})
     return out
 
 
@@ -229,17 +434,30 @@ def main() -> None:
     ap.add_argument(
         "--force-contains",
         action="store_true",
-        help="After getting fields, filter locally: q in kks or q in kks_name (case-insensitive).",
+        help=(
+            "Keep only items where q is in kks or kks_name (case-insensitive). The search is widened "
+            "with prefix matches on those fields (OR'd with q) and returns them with the hits; "
+            "the contains check itself runs locally."
+        ),
+    )
+
+    ap.add_argument(
+        "--refresh-list-cache",
+        action="store_true",
+        help="Ignore the cached list ids and look the list up again.",
     )
 
     args = ap.parse_args()
 
-    token = get_token_client_credentials(args.tenant_id, args.client_id, args.client_secret)
-    session = requests.Session()
-    session.headers.update({"Authorization": f"Bearer {token}", "Accept": "application/json"})
+    # One session (and connection pool) for the token and every Graph call.
+    session = new_graph_session()
+    token = get_token_client_credentials(
+        args.tenant_id, args.client_id, args.client_secret, session=session
+    )
+    session.headers["Authorization"] = f"Bearer {token}"
 
     print("Resolving site + region...")
-    site_id, region0 = resolve_site(session, args.site_url)
+    site_id, region0, site_lists = resolve_site_and_lists(session, args.site_url)
     tenant_hostname = urlparse(args.site_url).netloc  # generadorametropolitana.sharepoint.com
     region = region0 or discover_region(session, tenant_hostname)
     print("Auto region =", region)
@@ -247,44 +465,41 @@ def main() -> None:
     print(f"  region  = {region}")
 
     print("Resolving list id...")
-    list_id = resolve_list_id(session, site_id, args.list_title)
+    list_id, list_web_url = resolve_list(
+        session, site_id, args.list_title, lists=site_lists, refresh=args.refresh_list_cache
+    )
     print(f"  list_id = {list_id}")
 
     # IMPORTANT: Microsoft Search API returns tenant-wide results (within the selected region) for app-only calls.
     # Scope the query to THIS list (fallback to site) using a KQL Path filter via queryTemplate.
-    list_web_url = resolve_list_weburl(session, site_id, list_id)
     scope_url = list_web_url or args.site_url.rstrip('/')
     query_template = f'({{searchTerms}}) Path:"{scope_url}"'
 
+    select_fields = [args.field_kks, args.field_name]
+    query_string = args.q
+    search_request: Dict[str, Any] = {
+        "entityTypes": ["listItem"],
+        "from": 0,
+        "size": min(max(args.top, 1), 200),
+        "region": region,
+    }
+    if args.force_contains:
+        # Let KQL do the prefix match on the fields and return them with the
+        # hits, so most items need no separate field fetch.
+        term = kql_phrase(args.q)
+        prefix = kql_phrase(args.q, prefix=True)
+        query_string = f"({term} OR {args.field_kks}:{prefix} OR {args.field_name}:{prefix})"
+        search_request["fields"] = select_fields
+    search_request["query"] = {"queryString": query_string, "queryTemplate": query_template}
+
     # Search (application permissions flow -> beta + region)
     print("Running Graph Search (beta/search/query)...")
-    body = {
-        "requests": [
-            {
-                "entityTypes": ["listItem"],
-                "query": {"queryString": args.q, "queryTemplate": query_template},
-                "from": 0,
-                "size": min(max(args.top, 1), 200),
-                "region": region,
-            }
-        ]
-    }
+    body = {"requests": [search_request]}
     search_resp = graph_post(session, f"{GRAPH_BETA}/search/query", body)
     hits = extract_search_hits(search_resp)
 
     # Filter to the exact site/list
-    filtered = []
-    item_ids = []
-    for h in hits:
-        h_site_id, h_list_id, h_item_id = get_sp_ids_from_hit(h)
-        if not h_item_id:
-            continue
-        if h_list_id != list_id:
-            continue
-        if h_site_id and h_site_id != site_id:
-            continue
-        filtered.append(h)
-        item_ids.append(str(h_item_id))
+    filtered, item_ids = filter_list_hits(hits, site_id, list_id)
 
     print(f"Search hits total (raw): {len(hits)}")
     print(f"Search hits in your site+list: {len(filtered)}")
@@ -296,14 +511,22 @@ def main() -> None:
         print('  - trying prefix: e.g. "HSK18*"')
         return
 
-    # Fetch fields for those items (kks + kks_name)
-    fields_map = batch_get_listitem_fields(
-        session,
-        site_id=site_id,
-        list_id=list_id,
-        item_ids=item_ids,
-        select_fields=[args.field_kks, args.field_name],
-    )
+    # Fetch fields for those items (kks + kks_name), unless the search already returned them
+    fields_map: Dict[str, Dict[str, Any]] = {}
+    if args.force_contains:
+        for h, item_id in zip(filtered, item_ids):
+            f = get_fields_from_hit(h, select_fields)
+            if f is not None:
+                fields_map[item_id] = f
+    missing_ids = [item_id for item_id in item_ids if item_id not in fields_map]
+    if missing_ids:
+        fields_map.update(batch_get_listitem_fields(
+            session,
+            site_id=site_id,
+            list_id=list_id,
+            item_ids=missing_ids,
+            select_fields=select_fields,
+        ))
 
     q_norm = args.q.lower()
     rows = []
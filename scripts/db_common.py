@@ -0,0 +1,76 @@
+"""Utilidades compartidas por update_components.py y update_failures.py."""
+import json
+import os
+from pathlib import Path
+from typing import Any, Tuple
+
+try:
+    import orjson  # opcional: serializa varias veces más rápido que json
+except ImportError:  # pragma: no cover
+    orjson = None
+
+import pandas as pd  # requiere: pip install pandas openpyxl (opcional: python-calamine)
+
+
+# Textos que cuentan como celda vacía (tras strip + lower)
+BLANK_STRINGS = frozenset({"", "nan", "none"})
+
+
+def text_and_blank(col: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Retorna la columna como texto sin espacios y la máscara de valores en
+    blanco (None/NaN, "", "nan" o "none").
+    """
+    text = col.astype(str).str.strip()
+    blank = col.isna() | text.str.lower().isin(BLANK_STRINGS)
+    return text, blank
+
+
+def read_excel(path: Path) -> pd.DataFrame:
+    """
+    Lee el Excel con python-calamine si está instalado (lector en Rust, mucho
+    más rápido en archivos grandes); si no, usa el motor por defecto.
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return pd.read_excel(path)
+    try:
+        return pd.read_excel(path, engine="calamine")
+    except ValueError:
+        # pandas < 2.2 no conoce el motor "calamine"
+        return pd.read_excel(path)
+
+
+def load_db(path: Path, default: Any) -> Any:
+    """Carga la base JSON; si el archivo no existe retorna `default`."""
+    if path.exists():
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    return default
+
+
+def save_db(path: Path, data: Any) -> bool:
+    """
+    Escribe la base de forma atómica (archivo temporal + os.replace) y omite
+    la escritura si el contenido serializado es idéntico al del archivo
+    existente. Retorna True si escribió.
+    """
+    if orjson is not None:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    try:
+        if path.stat().st_size == len(raw) and path.read_bytes() == raw:
+            return False
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(raw)
+    os.replace(tmp, path)
+    return True
@@ -3,6 +3,7 @@ import importlib
 import traceback
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 CANDIDATES = ["src", "app.src", "app"]
 
@@ -17,21 +18,32 @@ def pick_package():
     raise RuntimeError(f"No package found. Tried: {CANDIDATES}. "
                        f"cwd={os.getcwd()} sys.path[0]={sys.path[0]}")
 
+def _warm(pkg_name):
+    importlib.import_module(pkg_name)
+
+def _try_import(name):
+    try:
+        importlib.import_module(name)
+    except Exception:
+        return name, traceback.format_exc()
+    return name, None
+
 def main():
     pkg_name = pick_package()
-    errors = []
     pkg = importlib.import_module(pkg_name)
+    names = [m.name for m in pkgutil.walk_packages(pkg.__path__, pkg.__name__ + ".")]
 
-    for m in pkgutil.walk_packages(pkg.__path__, pkg.__name__ + "."):
-        name = m.name
-        try:
-            importlib.import_module(name)
-        except Exception as e:
-            errors.append((name, e, traceback.format_exc()))
+    # Cada import es independiente: se reparten entre procesos (sin GIL ni
+    # sys.modules compartido) y los errores se juntan en el padre.
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(), initializer=_warm, initargs=(pkg_name,)
+    ) as ex:
+        results = list(ex.map(_try_import, names, chunksize=8))
+    errors = [(name, tb) for name, tb in results if tb is not None]
 
     if errors:
         print("\nIMPORT ERRORS:\n")
-        for name, e, tb in errors:
+        for name, tb in errors:
             print("=" * 80)
             print(name)
             print(tb)
@@ -1,12 +1,10 @@
 #!/usr/bin/env python
-import json
-import math
-import os
 from datetime import timezone
 from pathlib import Path
-from typing import Any, Dict
 
-import pandas as pd  # requiere: pip install pandas openpyxl
+import pandas as pd  # requiere: pip install pandas openpyxl (opcional: python-calamine)
+
+from db_common import load_db, read_excel, save_db, text_and_blank
 
 
 REQUIRED_COLS = [
@@ -40,19 +38,6 @@ def find_db_path() -> Path:
     return candidates[0]
 
 
-def load_db(path: Path) -> Dict[str, Any]:
-    if path.exists():
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-
-def save_db(path: Path, db: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(db, f, ensure_ascii=False, indent=2)
-
-
 def to_iso(dt) -> str:
     """Convierte un valor de Excel/pandas a ISO-8601 tipo 'YYYY-MM-DDTHH:MM:SSZ'."""
     ts = pd.to_datetime(dt)
@@ -62,13 +47,18 @@ def to_iso(dt) -> str:
     return ts.astimezone(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
-def is_blank(v) -> bool:
-    if v is None:
-        return True
-    if isinstance(v, float) and math.isnan(v):
-        return True
-    s = str(v).strip()
-    return s == "" or s.lower() in {"nan", "none"}
+def to_iso_column(col: pd.Series) -> pd.Series:
+    """Versión vectorizada de to_iso para una columna completa."""
+    try:
+        ts = pd.to_datetime(col)
+    except (TypeError, ValueError):
+        return col.map(to_iso)
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        # Zonas horarias mezcladas u otros objetos: se convierte valor a valor
+        return col.map(to_iso)
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert(timezone.utc)
+    return ts.dt.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
 
 
 def main() -> None:
@@ -84,7 +74,7 @@ def main() -> None:
         return
 
     try:
-        df = pd.read_excel(excel_path)
+        df = read_excel(excel_path)
     except Exception as e:
         print(f"No se pudo leer el Excel: {e}")
         return
@@ -102,48 +92,44 @@ def main() -> None:
     df = df[REQUIRED_COLS]
 
     # Filtrar filas sin kks o sin Modificado
-    rows = []
-    skipped_blank = 0
-    for _, row in df.iterrows():
-        if is_blank(row["kks"]) or is_blank(row["Modificado"]):
-            skipped_blank += 1
-            continue
-        rows.append(row)
+    kks_text, kks_blank = text_and_blank(df["kks"])
+    _, modified_blank = text_and_blank(df["Modificado"])
+    valid = ~(kks_blank | modified_blank)
+    skipped_blank = int((~valid).sum())
+    df = df[valid]
+    kks_col = kks_text[valid]
 
-    print(f"Filas válidas en Excel: {len(rows)} (saltadas por kks/Modificado en blanco: {skipped_blank})")
+    print(f"Filas válidas en Excel: {len(df)} (saltadas por kks/Modificado en blanco: {skipped_blank})")
 
     db_path = find_db_path()
-    db = load_db(db_path)
+    db = load_db(db_path, {})
     print(f"Base actual: {len(db)} componentes en {db_path}")
 
     new_count = 0
     updated_count = 0
     unchanged_count = 0
-
-    for row in rows:
-        kks = str(row["kks"]).strip()
-        if not kks:
-            skipped_blank += 1
-            continue
-
+    # Hay algo que escribir (registros nuevos o campos modificados)
+    dirty = False
+
+    # Normalización por columna (en C) en vez de fila a fila
+    def clean(col: str) -> pd.Series:
+        text, blank = text_and_blank(df[col])
+        return text.where(~blank, "")
+
+    names = clean("kks_name")
+    subtypes = clean("SubType")
+    type_names = clean("id_MainUT: Type_name")
+    updated_ats = to_iso_column(df["Modificado"])
+
+    for kks, ins_id, name, subtype, type_name, updated_at in zip(
+        kks_col, df["insID"], names, subtypes, type_names, updated_ats
+    ):
         # Campos desde Excel
-        ins_id = row["insID"]
         try:
             ins_id = int(ins_id)
         except Exception:
             ins_id = None
 
-        name = row["kks_name"]
-        name = str(name).strip() if not is_blank(name) else ""
-
-        subtype = row["SubType"]
-        subtype = str(subtype).strip() if not is_blank(subtype) else ""
-
-        type_name = row["id_MainUT: Type_name"]
-        type_name = str(type_name).strip() if not is_blank(type_name) else ""
-
-        updated_at = to_iso(row["Modificado"])
-
         new_meta = {
             "insID": ins_id,
             "kks_name": name,
@@ -161,23 +147,26 @@ def main() -> None:
             new_meta.setdefault("etag", f'W/"{ins_id or kks}"')
             db[kks] = new_meta
             new_count += 1
+            dirty = True
         else:
             old_updated = existing.get("updated_at")
-            # Merge: preserva claves viejas (ej: etag), pisa con lo nuevo
-            merged = dict(existing)
-            merged.update(new_meta)
+            # Merge en sitio: preserva claves viejas (ej: etag) y solo pisa
+            # las que cambiaron, sin copiar el registro completo por fila
+            diff = {k: v for k, v in new_meta.items() if k not in existing or existing[k] != v}
+            if diff:
+                existing.update(diff)
+                dirty = True
 
             if old_updated != updated_at:
                 # Hay cambios (según columna Modificado)
-                if "etag" not in merged:
-                    merged["etag"] = f'W/"{ins_id or kks}"'
-                db[kks] = merged
+                if "etag" not in existing:
+                    existing["etag"] = f'W/"{ins_id or kks}"'
+                    dirty = True
                 updated_count += 1
             else:
-                db[kks] = merged
                 unchanged_count += 1
 
-    save_db(db_path, db)
+    written = dirty and save_db(db_path, db)
 
     print()
     print("Resumen:")
@@ -186,7 +175,10 @@ def main() -> None:
     print(f"  Sin cambios:  {unchanged_count}")
     print(f"  Total en DB:  {len(db)}")
     print()
-    print(f"Actualizado: {db_path}")
+    if written:
+        print(f"Actualizado: {db_path}")
+    else:
+        print(f"Sin cambios, no se reescribió: {db_path}")
 
 
 if __name__ == "__main__":
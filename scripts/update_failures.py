@@ -1,10 +1,10 @@
 #!/usr/bin/env python
-import json
-import math
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple
 
-import pandas as pd  # pip install pandas openpyxl
+import pandas as pd  # pip install pandas openpyxl (opcional: python-calamine)
+
+from db_common import load_db, read_excel, save_db, text_and_blank
 
 
 # Columnas requeridas en el Excel (en español, con espacio)
@@ -31,26 +31,45 @@ def find_db_path() -> Path:
     return candidates[0]
 
 
-def load_db(path: Path) -> List[Dict[str, Any]]:
-    if path.exists():
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
+def to_date_column(col: pd.Series) -> pd.Series:
+    """Convierte una columna de fechas a 'YYYY-MM-DD' en una sola pasada."""
+    def one(v) -> str:
+        return pd.to_datetime(v).date().isoformat()
+
+    try:
+        ts = pd.to_datetime(col)
+    except (TypeError, ValueError):
+        return col.map(one)
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        # Zonas horarias mezcladas u otros objetos: se convierte valor a valor
+        return col.map(one)
+    return ts.dt.strftime("%Y-%m-%d")
 
 
-def save_db(path: Path, data: List[Dict[str, Any]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def existing_failure_keys(db: List[Dict[str, Any]]) -> Tuple[int, Set[Tuple[str, str, str]]]:
+    """
+    Retorna (ID máximo, claves existentes), con clave
+    (Component_ID, failure_date, type_failure), calculados por columna.
+    """
+    if not db:
+        return 0, set()
+    db_df = pd.DataFrame(db)
 
+    def text(col: str) -> pd.Series:
+        if col not in db_df:
+            return pd.Series([""] * len(db_df), index=db_df.index)
+        return db_df[col].fillna("").astype(str).str.strip()
 
-def is_blank(v) -> bool:
-    if v is None:
-        return True
-    if isinstance(v, float) and math.isnan(v):
-        return True
-    s = str(v).strip()
-    return s == "" or s.lower() in {"nan", "none"}
+    max_id = 0
+    if "ID" in db_df:
+        ids = pd.to_numeric(db_df["ID"], errors="coerce").fillna(0)
+        max_id = max(0, int(ids.max()))
+
+    cid = text("Component_ID")
+    fdate = text("failure_date")
+    ttype = text("type_failure")
+    has_key = (cid != "") & (fdate != "")
+    return max_id, set(zip(cid[has_key], fdate[has_key], ttype[has_key]))
 
 
 def normalize_cols(df: pd.DataFrame):
@@ -78,7 +97,7 @@ def main() -> None:
         return
 
     try:
-        df = pd.read_excel(excel_path)
+        df = read_excel(excel_path)
     except Exception as e:
         print(f"No se pudo leer el Excel: {e}")
         return
@@ -104,53 +123,31 @@ def main() -> None:
     col_tipo = col_map["tipo"]
 
     # Filtrar filas válidas: kks y fecha falla no vacíos
-    rows = []
-    skipped_blank = 0
-    for _, row in df.iterrows():
-        kks = row[col_kks]
-        fecha = row[col_fecha]
-        if is_blank(kks) or is_blank(fecha):
-            skipped_blank += 1
-            continue
-        rows.append(row)
+    kks_text, kks_blank = text_and_blank(df[col_kks])
+    _, fecha_blank = text_and_blank(df[col_fecha])
+    valid = ~(kks_blank | fecha_blank)
+    skipped_blank = int((~valid).sum())
+    df = df[valid]
 
-    print(f"Filas válidas en Excel: {len(rows)} (saltadas por kks/fecha falla en blanco: {skipped_blank})")
+    print(f"Filas válidas en Excel: {len(df)} (saltadas por kks/fecha falla en blanco: {skipped_blank})")
 
     db_path = find_db_path()
-    db = load_db(db_path)
+    db = load_db(db_path, [])
     print(f"Base actual: {len(db)} fallas en {db_path}")
 
     # Set para saber qué fallas ya existen (Component_ID, failure_date, type_failure)
-    existing_keys = set()
-    max_id = 0
-    for rec in db:
-        try:
-            rec_id = int(rec.get("ID", 0))
-        except Exception:
-            rec_id = 0
-        if rec_id > max_id:
-            max_id = rec_id
-
-        cid = str(rec.get("Component_ID", "")).strip()
-        fdate = str(rec.get("failure_date", "")).strip()
-        ttype = str(rec.get("type_failure", "")).strip()
-        if cid and fdate:
-            existing_keys.add((cid, fdate, ttype))
+    max_id, existing_keys = existing_failure_keys(db)
 
     next_id = max_id + 1
     added_count = 0
 
-    for row in rows:
-        kks = str(row[col_kks]).strip()
-        if not kks:
-            continue
-
-        # Fecha: normalizamos a YYYY-MM-DD
-        fdate = pd.to_datetime(row[col_fecha]).date().isoformat()
+    tipo_text, tipo_blank = text_and_blank(df[col_tipo])
+    type_failures = tipo_text.where(~tipo_blank, "")
 
-        tipo_val = row[col_tipo]
-        type_failure = "" if is_blank(tipo_val) else str(tipo_val).strip()
+    # Fecha: normalizamos a YYYY-MM-DD (por columna, no fila a fila)
+    fdates = to_date_column(df[col_fecha])
 
+    for kks, fdate, type_failure in zip(kks_text[valid], fdates, type_failures):
         key = (kks, fdate, type_failure)
         if key in existing_keys:
             continue
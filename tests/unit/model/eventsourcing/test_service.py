@@ -241,3 +241,42 @@ def test_rebuild_respects_snapshot_over_prior_events():
 
     g = GraphES.rebuild([e_after, snap])  # snapshot should win at its position
     assert "X" in g.nodes
+
+
+def test_rebuild_skips_events_before_last_active_snapshot():
+    base = ReliabilityGraph(auto_normalize=False)
+    base.clear()
+    base.add_node(
+        __import__("app.src.model.graph.node", fromlist=["ComponentNode"]).ComponentNode(
+            id="X",
+            dist=Dist("exponential"),
+        )
+    )
+
+    # would fail if replayed: target does not exist before the snapshot
+    e_bad = AddComponentRelativeEvent.create(
+        target_id="MISSING", new_comp_id="B", relation="series", dist={"kind": "exponential"}
+    )
+    snap = SnapshotEvent.create(data=base.to_data())
+    e_after = AddComponentRelativeEvent.create(
+        target_id="X", new_comp_id="A", relation="parallel", dist={"kind": "exponential"}
+    )
+
+    g = GraphES.rebuild([e_bad, snap, e_after])
+    assert "X" in g.nodes and "A" in g.nodes
+    assert "B" not in g.nodes
+
+
+def test_rebuild_ignored_snapshot_does_not_truncate_replay():
+    base = ReliabilityGraph(auto_normalize=False)
+    base.clear()
+
+    e1 = AddRootComponentEvent.create(new_comp_id="A", dist={"kind": "exponential"})
+    e1.version = 1
+    snap = SnapshotEvent.create(data=base.to_data())
+    snap.version = 2
+    ign = SetIgnoreRangeEvent.create(start_v=2, end_v=2)
+    ign.version = 3
+
+    g = GraphES.rebuild([e1, snap, ign])
+    assert "A" in g.nodes
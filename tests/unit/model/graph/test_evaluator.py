@@ -116,6 +116,34 @@ def test_eval_koon_gate_k_out_of_n(monkeypatch):
     assert math.isclose(r, 0.72, rel_tol=0, abs_tol=1e-12)
 
 
+def test_eval_koon_gate_matches_enumeration(monkeypatch):
+    from itertools import product
+
+    probs = {"A": 0.9, "B": 0.8, "C": 0.7, "D": 0.6}
+    g1 = KoonGateNode(id="G1", k=2)
+    nodes = {"G1": g1}
+    children = {"G1": list(probs)}
+    for cid, p in probs.items():
+        nodes[cid] = ComponentNode(id=cid, dist=DummyDist(r=p))
+        children[cid] = []
+
+    g = DummyGraph(nodes=nodes, children=children, root="G1")
+    ev = ReliabilityEvaluator(g)
+    monkeypatch.setattr(node_mod, "has_enough_records", lambda *a, **k: True)
+
+    expected = 0.0
+    for states in product((0, 1), repeat=len(probs)):
+        if sum(states) < 2:
+            continue
+        term = 1.0
+        for up, p in zip(states, probs.values()):
+            term *= p if up else (1.0 - p)
+        expected += term
+
+    r = ev.evaluate()
+    assert math.isclose(r, expected, rel_tol=0, abs_tol=1e-12)
+
+
 def test_evaluator_memoization_avoids_recomputing(monkeypatch):
     calls = {"n": 0}
 
@@ -142,3 +170,46 @@ def test_evaluator_memoization_avoids_recomputing(monkeypatch):
     r = ev.evaluate()
     assert math.isclose(r, 0.25, rel_tol=0, abs_tol=1e-12)
     assert calls["n"] == 1  # memo hit
+
+
+def test_evaluator_loads_failures_cache_once_per_pass(monkeypatch):
+    class CountingCache:
+        def __init__(self):
+            self.loads = 0
+
+        def load_failures_cache(self, project_root=None):
+            self.loads += 1
+            return {"items": {}}
+
+        def save_failures_cache(self, cache, project_root=None):
+            pass
+
+    class CacheReadingDist(Dist):
+        def __init__(self):
+            super().__init__(kind="exponential")
+
+        def reliability(self, comp_id, now, project_root=None, cache=None):
+            cache.load_failures_cache(project_root)
+            return 0.9
+
+    g1 = AndGateNode(id="G1")
+    a = ComponentNode(id="A", dist=CacheReadingDist())
+    b = ComponentNode(id="B", dist=CacheReadingDist())
+    g = DummyGraph(
+        nodes={"G1": g1, "A": a, "B": b},
+        children={"G1": ["A", "B"], "A": [], "B": []},
+        root="G1",
+    )
+    inner = CountingCache()
+    ev = ReliabilityEvaluator(g)
+    ev.failures_cache = inner
+    monkeypatch.setattr(
+        node_mod,
+        "has_enough_records",
+        lambda comp_id, project_root, cache=None: bool(cache.load_failures_cache(project_root)),
+    )
+
+    ev.evaluate()
+
+    assert inner.loads == 1
+    assert ev.failures_cache is inner
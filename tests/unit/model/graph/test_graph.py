@@ -446,6 +446,29 @@ def test_rename_node_updates_children_parent_pointers_and_references():
     assert g.root == "Y"
 
 
+def test_component_ids_sorted_and_refreshed_after_mutations():
+    g = ReliabilityGraph()
+    g.clear()
+
+    g.add_node(AndGateNode(id="X"))
+    g.add_node(ComponentNode(id="B", dist=Dist(kind="exponential")))
+    g.add_node(ComponentNode(id="A", dist=Dist(kind="exponential")))
+    g.add_edge("X", "B")
+    g.add_edge("X", "A")
+
+    assert g.component_ids() == ["A", "B"]
+    assert [(nid, n.id) for nid, n in g.components()] == [("A", "A"), ("B", "B")]
+
+    g._rename_node("B", "C")
+    assert g.component_ids() == ["A", "C"]
+
+    g._remove_component("A")
+    assert g.component_ids() == ["C"]
+
+    g.clear()
+    assert g.component_ids() == []
+
+
 def test_replace_child_replaces_with_new_child_and_clears_old_parent():
     g = ReliabilityGraph()
     g.clear()
@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+APP = Path(__file__).resolve().parents[3] / "app"  # los servicios importan "src."
+if str(APP) not in sys.path:
+    sys.path.insert(0, str(APP))
+
+# El código de servicios usa f-strings de Python 3.12 (PEP 701)
+if sys.version_info < (3, 12):
+    collect_ignore_glob = ["*"]
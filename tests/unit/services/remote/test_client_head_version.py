@@ -0,0 +1,69 @@
+import pytest
+
+from src.services.remote import client as client_mod
+from src.services.remote.errors import CloudOperationError
+
+
+class LocalImpl:
+    def __init__(self, events=None):
+        self.events = events or []
+        self.loads = 0
+
+    def load_events(self):
+        self.loads += 1
+        return list(self.events)
+
+
+class EventsClientImpl:
+    def __init__(self, head=0, error=None):
+        self.head = head
+        self.error = error
+
+    def read_max_version(self):
+        if self.error is not None:
+            raise self.error
+        return self.head
+
+
+def make_client(monkeypatch, sp, local):
+    monkeypatch.setattr(client_mod, "LocalWorkspaceStore", lambda: local)
+    cloud = client_mod.CloudClient(base_dir=".")
+    monkeypatch.setattr(cloud, "_sp_events", lambda: sp)
+    return cloud
+
+
+def test_head_version_without_fallback_returns_sharepoint_head(monkeypatch):
+    local = LocalImpl([{"version": 1}])
+    cloud = make_client(monkeypatch, EventsClientImpl(head=7), local)
+
+    assert cloud.get_head_version(allow_local_fallback=False) == 7
+    assert local.loads == 0
+
+
+def test_head_version_without_fallback_raises_on_sharepoint_error(monkeypatch):
+    local = LocalImpl([{"version": 1}, {"version": 2}])
+    sp = EventsClientImpl(error=RuntimeError("boom"))
+    cloud = make_client(monkeypatch, sp, local)
+
+    with pytest.raises(CloudOperationError) as exc_info:
+        cloud.get_head_version(allow_local_fallback=False, operation="draft-load")
+
+    assert exc_info.value.operation == "draft-load"
+    assert local.loads == 0
+
+
+def test_head_version_without_fallback_requires_sharepoint_config(monkeypatch):
+    cloud = make_client(monkeypatch, None, LocalImpl([{"version": 3}]))
+
+    with pytest.raises(CloudOperationError) as exc_info:
+        cloud.get_head_version(allow_local_fallback=False)
+
+    assert exc_info.value.code in ("config_missing", "config_invalid")
+
+
+def test_head_version_falls_back_to_local_log_on_error(monkeypatch):
+    local = LocalImpl([{"version": 1}, {"version": 4}])
+    sp = EventsClientImpl(error=RuntimeError("boom"))
+    cloud = make_client(monkeypatch, sp, local)
+
+    assert cloud.get_head_version() == 4